@@ -0,0 +1,36 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import aclose_clients
+from src.jarvis import JARVIS
+
+
+async def main():
+    jarvis = JARVIS(verbose=False)
+    
+    tasks = [
+        "Посчитай сумму чисел от 1 до 1000",
+        "Выведи список файлов в текущей директории",
+        "Найди среднее значение чисел 3, 7, 15, 42",
+        "Покажи текущую дату и время"
+    ]
+    
+    start = time.perf_counter()
+    try:
+        answers = await asyncio.gather(*(jarvis.arun(task) for task in tasks))
+    finally:
+        await aclose_clients()
+    elapsed = time.perf_counter() - start
+    
+    for task, answer in zip(tasks, answers):
+        print(f"📋 {task}\n{answer}\n")
+    
+    print(f"⏱️ {len(tasks)} задач за {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault("EMBEDDER", "hashing")
+os.environ.setdefault("EMBEDDING_DIM", "256")
+
+from src.memory import MemoryAgent
+
+
+def writer(memory: MemoryAgent, worker: int, count: int) -> list[int]:
+    ids = []
+    for i in range(count):
+        ids.extend(memory.add_many([f"worker {worker} task {i}"], [{"agent": f"worker_{worker}"}]))
+    return ids
+
+
+def reader(memory: MemoryAgent, worker: int, count: int) -> int:
+    found = 0
+    for i in range(count):
+        found += len(memory.search(f"worker {worker % 4} task {i}", k=3))
+        memory.get_recent(5)
+    return found
+
+
+def main():
+    memory = MemoryAgent()
+    writers, readers, per_thread = 8, 8, 200
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=writers + readers) as pool:
+        write_jobs = [pool.submit(writer, memory, w, per_thread) for w in range(writers)]
+        read_jobs = [pool.submit(reader, memory, r, per_thread) for r in range(readers)]
+        
+        ids = [idx for job in write_jobs for idx in job.result()]
+        searches = sum(job.result() for job in read_jobs)
+    elapsed = time.perf_counter() - start
+    
+    expected = writers * per_thread
+    assert len(ids) == expected, f"expected {expected} ids, got {len(ids)}"
+    assert len(set(ids)) == expected, "duplicate ids allocated"
+    assert len(memory.store) == expected == memory.index.ntotal, "store and index out of sync"
+    assert all(memory.store[idx]["id"] == idx for idx in ids), "store entries do not match their ids"
+    
+    print(f"✅ {expected} writes and {readers * per_thread} searches ({searches} hits) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 
 from src.agents.analyst.state import AnalystState
@@ -10,8 +11,8 @@ def build_analyst_graph(tools: list, logger: AgentLogger = None):
     
     workflow = StateGraph(AnalystState)
     
-    workflow.add_node("analyze", node.analyze)
-    workflow.add_node("call_tools", node.call_tools)
+    workflow.add_node("analyze", RunnableLambda(node.analyze, node.aanalyze))
+    workflow.add_node("call_tools", RunnableLambda(node.call_tools, node.acall_tools))
     workflow.add_node("finalize", node.finalize)
     
     workflow.set_entry_point("analyze")
@@ -1,12 +1,12 @@
 import json
 import re
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
 
 from src.prompts import PromptLoader
 from src.agents.analyst.state import AnalystState
-from src.utils import AgentLogger
+from src.utils import AgentLogger, ToolRunner, invoke_streaming, ainvoke_streaming
 from src.config import Settings
+from src.core.clients import chat_model
 
 
 def extract_json(text: str) -> dict:
@@ -29,51 +29,46 @@ class AnalystNode:
         
         search_tools = [t for t in tools if t.name in ["search_web", "search_memory"]]
         
-        self.llm = ChatOpenAI(
-            api_key=settings.api_key,
-            base_url=settings.base_url,
-            model=settings.model,
-            temperature=0.7
-        ).bind_tools(search_tools)
+        self.llm = chat_model("analyst", 0.7, settings).bind_tools(search_tools)
         
         self.prompts = PromptLoader()
         self.logger = logger
         self.tools = {tool.name: tool for tool in search_tools}
+        self.runner = ToolRunner(search_tools, settings)
     
     def analyze(self, state: AnalystState) -> dict:
-        if self.logger:
-            self.logger.agent_start("Analyst", state["user_input"])
-            self.logger.thinking("Analyst")
+        messages = self._start(state)
+        response = invoke_streaming(self.llm, messages, self.logger, "Analyst decision")
+        self._log_tool_calls(response)
+        return self._decision(response, messages, "Analyzing")
+    
+    async def aanalyze(self, state: AnalystState) -> dict:
+        messages = self._start(state)
+        response = await ainvoke_streaming(self.llm, messages, self.logger, "Analyst decision")
+        self._log_tool_calls(response)
+        return self._decision(response, messages, "Analyzing")
+    
+    def call_tools(self, state: AnalystState) -> dict:
+        decision = state["decision"]
+        response = decision.get("response")
+        messages = decision.get("messages", [])
         
-        prompt = self.prompts.load("analyst")
+        if not hasattr(response, 'tool_calls') or not response.tool_calls:
+            return {}
         
-        messages = [
-            SystemMessage(content=prompt["system"]),
-            HumanMessage(content=state["user_input"])
-        ]
+        messages.append(AIMessage(content=response.content or "", tool_calls=response.tool_calls))
         
-        response = self.llm.invoke(messages)
+        tool_calls = self.runner.select(response.tool_calls)
+        for tool_call in tool_calls:
+            self._tool_start(tool_call)
         
-        if self.logger:
-            if response.content:
-                self.logger.stream_start("Analyst decision")
-                self.logger.stream_token(response.content)
-                self.logger.stream_end()
-            
-            if hasattr(response, 'tool_calls') and response.tool_calls:
-                self.logger.step(f"Tool calls: {[t['name'] for t in response.tool_calls]}")
+        for tool_call, result in zip(tool_calls, self.runner.run(tool_calls)):
+            messages.append(self._tool_end(tool_call, result))
         
-        return {
-            "decision": {
-                "agent": "processing",
-                "reasoning": "Analyzing",
-                "task": response.content if response.content else "",
-                "response": response,
-                "messages": messages
-            }
-        }
+        response = invoke_streaming(self.llm, messages, self.logger, "Analyst decision")
+        return self._decision(response, messages, "Analyzing with tools results")
     
-    def call_tools(self, state: AnalystState) -> dict:
+    async def acall_tools(self, state: AnalystState) -> dict:
         decision = state["decision"]
         response = decision.get("response")
         messages = decision.get("messages", [])
@@ -83,31 +78,15 @@ class AnalystNode:
         
         messages.append(AIMessage(content=response.content or "", tool_calls=response.tool_calls))
         
-        for tool_call in response.tool_calls:
-            tool = self.tools.get(tool_call["name"])
-            if tool:
-                if self.logger:
-                    self.logger.tool_start(tool_call["name"], tool_call["args"])
-                
-                result = tool.invoke(tool_call["args"])
-                
-                if self.logger:
-                    success = "❌" not in str(result) if result else True
-                    self.logger.tool_end(tool_call["name"], success, str(result))
-                
-                messages.append(ToolMessage(content=str(result), tool_call_id=tool_call["id"]))
-        
-        response = self.llm.invoke(messages)
+        tool_calls = self.runner.select(response.tool_calls)
+        for tool_call in tool_calls:
+            self._tool_start(tool_call)
         
-        return {
-            "decision": {
-                "agent": "processing",
-                "reasoning": "Analyzing with tools results",
-                "task": response.content if response.content else "",
-                "response": response,
-                "messages": messages
-            }
-        }
+        for tool_call, result in zip(tool_calls, await self.runner.arun(tool_calls)):
+            messages.append(self._tool_end(tool_call, result))
+        
+        response = await ainvoke_streaming(self.llm, messages, self.logger, "Analyst decision")
+        return self._decision(response, messages, "Analyzing with tools results")
     
     def finalize(self, state: AnalystState) -> dict:
         decision = state["decision"]
@@ -140,3 +119,42 @@ class AnalystNode:
             return "call_tools"
         
         return "finalize"
+    
+    def _start(self, state: AnalystState) -> list:
+        if self.logger:
+            self.logger.agent_start("Analyst", state["user_input"])
+            self.logger.thinking("Analyst")
+        
+        prompt = self.prompts.load("analyst")
+        
+        return [
+            SystemMessage(content=prompt["system"]),
+            HumanMessage(content=state["user_input"])
+        ]
+    
+    def _log_tool_calls(self, response):
+        if self.logger:
+            if hasattr(response, 'tool_calls') and response.tool_calls:
+                self.logger.step(f"Tool calls: {[t['name'] for t in response.tool_calls]}")
+    
+    def _decision(self, response, messages: list, reasoning: str) -> dict:
+        return {
+            "decision": {
+                "agent": "processing",
+                "reasoning": reasoning,
+                "task": response.content if response.content else "",
+                "response": response,
+                "messages": messages
+            }
+        }
+    
+    def _tool_start(self, tool_call: dict):
+        if self.logger:
+            self.logger.tool_start(tool_call["name"], tool_call["args"])
+    
+    def _tool_end(self, tool_call: dict, result) -> ToolMessage:
+        if self.logger:
+            success = "❌" not in str(result) if result else True
+            self.logger.tool_end(tool_call["name"], success, str(result))
+        
+        return ToolMessage(content=str(result), tool_call_id=tool_call["id"])
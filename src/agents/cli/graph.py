@@ -1,3 +1,4 @@
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 
 from src.agents.cli.state import CLIState
@@ -10,8 +11,8 @@ def build_cli_graph(tools: list, logger: AgentLogger = None):
     
     workflow = StateGraph(CLIState)
     
-    workflow.add_node("start", node.start)
-    workflow.add_node("call_tools", node.call_tools)
+    workflow.add_node("start", RunnableLambda(node.start, node.astart))
+    workflow.add_node("call_tools", RunnableLambda(node.call_tools, node.acall_tools))
     
     workflow.set_entry_point("start")
     
@@ -1,57 +1,60 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
 
 from src.prompts import PromptLoader
 from src.agents.cli.state import CLIState
-from src.utils import AgentLogger
+from src.utils import AgentLogger, ToolRunner, invoke_streaming, ainvoke_streaming
 from src.config import Settings
+from src.core.clients import chat_model
 
 
 class CLINode:
     def __init__(self, tools: list, logger: AgentLogger = None):
         settings = Settings()
-        self.llm = ChatOpenAI(
-            api_key=settings.api_key,
-            base_url=settings.base_url,
-            model=settings.model,
-            temperature=0.7
-        ).bind_tools(tools)
+        self.llm = chat_model("cli", 0.7, settings).bind_tools(tools)
         
         self.prompts = PromptLoader()
         self.logger = logger
         self.tools = {tool.name: tool for tool in tools}
+        self.runner = ToolRunner(tools, settings)
     
     def start(self, state: CLIState) -> dict:
-        if self.logger:
-            self.logger.agent_start("CLI Agent", state["task"])
-            self.logger.thinking("CLI Agent")
+        messages = self._messages(state)
+        response = invoke_streaming(self.llm, messages, self.logger, "CLI Agent response")
+        return self._started(messages, response)
+    
+    async def astart(self, state: CLIState) -> dict:
+        messages = self._messages(state)
+        response = await ainvoke_streaming(self.llm, messages, self.logger, "CLI Agent response")
+        return self._started(messages, response)
+    
+    def call_tools(self, state: CLIState) -> dict:
+        response = state["response"]
+        messages = state.get("messages", [])
+        commands = state.get("commands", [])
+        results = state.get("results", [])
         
-        prompt = self.prompts.load("cli_agent")
+        if not hasattr(response, 'tool_calls') or not response.tool_calls:
+            return {}
         
-        messages = [
-            SystemMessage(content=prompt["system"]),
-            HumanMessage(content=state["task"])
-        ]
+        messages.append(AIMessage(content=response.content or "", tool_calls=response.tool_calls))
         
-        response = self.llm.invoke(messages)
+        tool_calls = self.runner.select(response.tool_calls)
+        for tool_call in tool_calls:
+            self._tool_start(tool_call, commands)
         
-        if self.logger:
-            if response.content:
-                self.logger.stream_start("CLI Agent response")
-                self.logger.stream_token(response.content)
-                self.logger.stream_end()
-            
-            if hasattr(response, 'tool_calls') and response.tool_calls:
-                self.logger.step(f"Tool calls: {[t['name'] for t in response.tool_calls]}")
+        for tool_call, tool_result in zip(tool_calls, self.runner.run(tool_calls)):
+            messages.append(self._tool_end(tool_call, tool_result, results))
+        
+        response = invoke_streaming(self.llm, messages, self.logger, "CLI Agent response")
         
         return {
             "messages": messages,
             "response": response,
-            "commands": [],
-            "results": []
+            "commands": commands,
+            "results": results
         }
     
-    def call_tools(self, state: CLIState) -> dict:
+    async def acall_tools(self, state: CLIState) -> dict:
         response = state["response"]
         messages = state.get("messages", [])
         commands = state.get("commands", [])
@@ -62,44 +65,14 @@ class CLINode:
         
         messages.append(AIMessage(content=response.content or "", tool_calls=response.tool_calls))
         
-        for tool_call in response.tool_calls:
-            tool = self.tools.get(tool_call["name"])
-            if tool:
-                if tool_call["name"] == "execute_shell_command":
-                    command = tool_call["args"]["command"]
-                    commands.append(command)
-                    
-                    if self.logger:
-                        self.logger.cli_commands([command])
-                
-                if self.logger:
-                    self.logger.tool_start(tool_call["name"], tool_call["args"])
-                
-                tool_result = tool.invoke(tool_call["args"])
-                
-                if self.logger:
-                    success = "❌" not in tool_result if isinstance(tool_result, str) else True
-                    self.logger.tool_end(tool_call["name"], success, tool_result if tool_call["name"] in ["search_memory", "search_web"] else None)
-                
-                if tool_call["name"] == "execute_shell_command":
-                    if "✅" in tool_result:
-                        clean_output = tool_result.replace("✅ ", "").strip()
-                        status = "success"
-                    else:
-                        clean_output = tool_result.replace("❌ Ошибка: ", "").replace("❌ ", "").strip()
-                        status = "error"
-                    
-                    results.append({
-                        "command": command,
-                        "result": {"status": status, "output": clean_output}
-                    })
-                    
-                    if self.logger:
-                        self.logger.cli_result(results[-1])
-                
-                messages.append(ToolMessage(content=str(tool_result), tool_call_id=tool_call["id"]))
-        
-        response = self.llm.invoke(messages)
+        tool_calls = self.runner.select(response.tool_calls)
+        for tool_call in tool_calls:
+            self._tool_start(tool_call, commands)
+        
+        for tool_call, tool_result in zip(tool_calls, await self.runner.arun(tool_calls)):
+            messages.append(self._tool_end(tool_call, tool_result, results))
+        
+        response = await ainvoke_streaming(self.llm, messages, self.logger, "CLI Agent response")
         
         return {
             "messages": messages,
@@ -118,3 +91,61 @@ class CLINode:
             return "call_tools"
         
         return "end"
+    
+    def _messages(self, state: CLIState) -> list:
+        if self.logger:
+            self.logger.agent_start("CLI Agent", state["task"])
+            self.logger.thinking("CLI Agent")
+        
+        prompt = self.prompts.load("cli_agent")
+        
+        return [
+            SystemMessage(content=prompt["system"]),
+            HumanMessage(content=state["task"])
+        ]
+    
+    def _started(self, messages: list, response) -> dict:
+        if self.logger:
+            if hasattr(response, 'tool_calls') and response.tool_calls:
+                self.logger.step(f"Tool calls: {[t['name'] for t in response.tool_calls]}")
+        
+        return {
+            "messages": messages,
+            "response": response,
+            "commands": [],
+            "results": []
+        }
+    
+    def _tool_start(self, tool_call: dict, commands: list):
+        if tool_call["name"] == "execute_shell_command":
+            command = tool_call["args"]["command"]
+            commands.append(command)
+            
+            if self.logger:
+                self.logger.cli_commands([command])
+        
+        if self.logger:
+            self.logger.tool_start(tool_call["name"], tool_call["args"])
+    
+    def _tool_end(self, tool_call: dict, tool_result, results: list) -> ToolMessage:
+        if self.logger:
+            success = "❌" not in tool_result if isinstance(tool_result, str) else True
+            self.logger.tool_end(tool_call["name"], success, tool_result if tool_call["name"] in ["search_memory", "search_web"] else None)
+        
+        if tool_call["name"] == "execute_shell_command":
+            if "✅" in tool_result:
+                clean_output = tool_result.replace("✅ ", "").strip()
+                status = "success"
+            else:
+                clean_output = tool_result.replace("❌ Ошибка: ", "").replace("❌ ", "").strip()
+                status = "error"
+            
+            results.append({
+                "command": tool_call["args"]["command"],
+                "result": {"status": status, "output": clean_output}
+            })
+            
+            if self.logger:
+                self.logger.cli_result(results[-1])
+        
+        return ToolMessage(content=str(tool_result), tool_call_id=tool_call["id"])
@@ -1,3 +1,4 @@
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 
 from src.agents.command.state import CommandState
@@ -10,10 +11,10 @@ def build_command_graph(tools: list, logger: AgentLogger = None):
     
     workflow = StateGraph(CommandState)
     
-    workflow.add_node("start", node.start)
-    workflow.add_node("call_tools", node.call_tools)
-    workflow.add_node("debug", node.debug)
-    workflow.add_node("review", node.review)
+    workflow.add_node("start", RunnableLambda(node.start, node.astart))
+    workflow.add_node("call_tools", RunnableLambda(node.call_tools, node.acall_tools))
+    workflow.add_node("debug", RunnableLambda(node.debug, node.adebug))
+    workflow.add_node("review", RunnableLambda(node.review, node.areview))
     
     workflow.set_entry_point("start")
     
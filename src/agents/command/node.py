@@ -1,10 +1,10 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
 
 from src.prompts import PromptLoader
 from src.agents.command.state import CommandState
 from src.config import Settings
-from src.utils import AgentLogger
+from src.core.clients import chat_model
+from src.utils import AgentLogger, ToolRunner, invoke_streaming, ainvoke_streaming
 
 
 def clean_code_block(code: str) -> str:
@@ -21,50 +21,55 @@ def clean_code_block(code: str) -> str:
 class CommandNode:
     def __init__(self, tools: list, logger: AgentLogger = None):
         settings = Settings()
-        self.llm = ChatOpenAI(
-            api_key=settings.api_key,
-            base_url=settings.base_url,
-            model=settings.model,
-            temperature=0.7
-        ).bind_tools(tools)
+        self.llm = chat_model("command", 0.7, settings).bind_tools(tools)
         
         self.prompts = PromptLoader()
         self.settings = settings
         self.logger = logger
         self.tools = {tool.name: tool for tool in tools}
+        self.runner = ToolRunner(tools, settings)
     
     def start(self, state: CommandState) -> dict:
-        if self.logger:
-            self.logger.agent_start("Command Agent", state["task"])
-            self.logger.thinking("Command Agent")
+        messages = self._messages(state)
+        response = invoke_streaming(self.llm, messages, self.logger, "Command Agent response")
+        return self._started(state, messages, response)
+    
+    async def astart(self, state: CommandState) -> dict:
+        messages = self._messages(state)
+        response = await ainvoke_streaming(self.llm, messages, self.logger, "Command Agent response")
+        return self._started(state, messages, response)
+    
+    def call_tools(self, state: CommandState) -> dict:
+        response = state["response"]
+        messages = state.get("messages", [])
         
-        prompt = self.prompts.load("command_agent")
+        if not hasattr(response, 'tool_calls') or not response.tool_calls:
+            return {}
         
-        messages = [
-            SystemMessage(content=prompt["system"]),
-            HumanMessage(content=state["task"])
-        ]
+        messages.append(AIMessage(content=response.content or "", tool_calls=response.tool_calls))
         
-        response = self.llm.invoke(messages)
+        code = None
+        result = None
         
-        if self.logger:
-            if response.content:
-                self.logger.stream_start("Command Agent response")
-                self.logger.stream_token(response.content)
-                self.logger.stream_end()
-            
-            if hasattr(response, 'tool_calls') and response.tool_calls:
-                self.logger.step(f"Tool calls: {[t['name'] for t in response.tool_calls]}")
+        tool_calls = self.runner.select(response.tool_calls)
+        for tool_call in tool_calls:
+            code = self._tool_start(tool_call) or code
+        
+        for tool_call, tool_result in zip(tool_calls, self.runner.run(tool_calls)):
+            message, tool_code_result = self._tool_end(tool_call, tool_result)
+            result = tool_code_result or result
+            messages.append(message)
+        
+        response = invoke_streaming(self.llm, messages, self.logger, "Command Agent response")
         
         return {
             "messages": messages,
             "response": response,
-            "code": None,
-            "result": None,
-            "retry_count": state.get("retry_count", 0)
+            "code": code or state.get("code"),
+            "result": result or state.get("result")
         }
     
-    def call_tools(self, state: CommandState) -> dict:
+    async def acall_tools(self, state: CommandState) -> dict:
         response = state["response"]
         messages = state.get("messages", [])
         
@@ -76,37 +81,16 @@ class CommandNode:
         code = None
         result = None
         
-        for tool_call in response.tool_calls:
-            tool = self.tools.get(tool_call["name"])
-            if tool:
-                if tool_call["name"] == "execute_python_code":
-                    code = tool_call["args"]["code"]
-                    if self.logger:
-                        self.logger.code_generated(code)
-                
-                if self.logger:
-                    self.logger.tool_start(tool_call["name"], tool_call["args"])
-                
-                tool_result = tool.invoke(tool_call["args"])
-                
-                if self.logger:
-                    success = "❌" not in tool_result if isinstance(tool_result, str) else True
-                    self.logger.tool_end(tool_call["name"], success, tool_result if tool_call["name"] in ["search_memory", "search_web"] else None)
-                
-                if tool_call["name"] == "execute_python_code":
-                    if "✅" in tool_result:
-                        clean_output = tool_result.replace("✅ Успешно выполнено:\n", "").strip()
-                        result = {"status": "success", "output": clean_output}
-                    else:
-                        clean_output = tool_result.replace("❌ Ошибка:\n", "").strip()
-                        result = {"status": "error", "output": clean_output}
-                    
-                    if self.logger:
-                        self.logger.code_result(result)
-                
-                messages.append(ToolMessage(content=str(tool_result), tool_call_id=tool_call["id"]))
+        tool_calls = self.runner.select(response.tool_calls)
+        for tool_call in tool_calls:
+            code = self._tool_start(tool_call) or code
         
-        response = self.llm.invoke(messages)
+        for tool_call, tool_result in zip(tool_calls, await self.runner.arun(tool_calls)):
+            message, tool_code_result = self._tool_end(tool_call, tool_result)
+            result = tool_code_result or result
+            messages.append(message)
+        
+        response = await ainvoke_streaming(self.llm, messages, self.logger, "Command Agent response")
         
         return {
             "messages": messages,
@@ -116,6 +100,133 @@ class CommandNode:
         }
     
     def debug(self, state: CommandState) -> dict:
+        retry_count, messages = self._debug_messages(state)
+        
+        response = self.llm.invoke(messages)
+        fixed_code = self._fixed_code(response)
+        
+        tool = self.tools.get("execute_python_code")
+        if tool:
+            if self.logger:
+                self.logger.tool_start("execute_python_code", {"code": fixed_code})
+            
+            tool_result = tool.invoke({"code": fixed_code})
+            return self._debugged(fixed_code, tool_result, retry_count)
+        
+        return {"retry_count": retry_count}
+    
+    async def adebug(self, state: CommandState) -> dict:
+        retry_count, messages = self._debug_messages(state)
+        
+        response = await self.llm.ainvoke(messages)
+        fixed_code = self._fixed_code(response)
+        
+        tool = self.tools.get("execute_python_code")
+        if tool:
+            if self.logger:
+                self.logger.tool_start("execute_python_code", {"code": fixed_code})
+            
+            tool_result = await tool.ainvoke({"code": fixed_code})
+            return self._debugged(fixed_code, tool_result, retry_count)
+        
+        return {"retry_count": retry_count}
+    
+    def review(self, state: CommandState) -> dict:
+        messages = self._review_messages(state)
+        response = self.llm.invoke(messages)
+        return self._reviewed(response)
+    
+    async def areview(self, state: CommandState) -> dict:
+        messages = self._review_messages(state)
+        response = await self.llm.ainvoke(messages)
+        return self._reviewed(response)
+    
+    def should_continue(self, state: CommandState) -> str:
+        response = state.get("response")
+        
+        if not response:
+            return "review"
+        
+        if hasattr(response, 'tool_calls') and response.tool_calls:
+            return "call_tools"
+        
+        return "review"
+    
+    def should_debug_or_review(self, state: CommandState) -> str:
+        result = state.get("result")
+        response = state.get("response")
+        retry_count = state.get("retry_count", 0)
+        
+        if result is None:
+            if response and hasattr(response, 'tool_calls') and response.tool_calls:
+                return "call_tools"
+            return "review"
+        
+        if isinstance(result, dict) and result.get("status") == "error":
+            if retry_count < 3:
+                return "debug"
+        
+        return "review"
+    
+    def _messages(self, state: CommandState) -> list:
+        if self.logger:
+            self.logger.agent_start("Command Agent", state["task"])
+            self.logger.thinking("Command Agent")
+        
+        prompt = self.prompts.load("command_agent")
+        
+        return [
+            SystemMessage(content=prompt["system"]),
+            HumanMessage(content=state["task"])
+        ]
+    
+    def _started(self, state: CommandState, messages: list, response) -> dict:
+        if self.logger:
+            if hasattr(response, 'tool_calls') and response.tool_calls:
+                self.logger.step(f"Tool calls: {[t['name'] for t in response.tool_calls]}")
+        
+        return {
+            "messages": messages,
+            "response": response,
+            "code": None,
+            "result": None,
+            "retry_count": state.get("retry_count", 0)
+        }
+    
+    def _tool_start(self, tool_call: dict) -> str:
+        code = None
+        if tool_call["name"] == "execute_python_code":
+            code = tool_call["args"]["code"]
+            if self.logger:
+                self.logger.code_generated(code)
+        
+        if self.logger:
+            self.logger.tool_start(tool_call["name"], tool_call["args"])
+        
+        return code
+    
+    def _tool_end(self, tool_call: dict, tool_result) -> tuple:
+        if self.logger:
+            success = "❌" not in tool_result if isinstance(tool_result, str) else True
+            self.logger.tool_end(tool_call["name"], success, tool_result if tool_call["name"] in ["search_memory", "search_web"] else None)
+        
+        result = None
+        if tool_call["name"] == "execute_python_code":
+            result = self._code_result(tool_result)
+            if self.logger:
+                self.logger.code_result(result)
+        
+        return ToolMessage(content=str(tool_result), tool_call_id=tool_call["id"]), result
+    
+    def _code_result(self, tool_result: str) -> dict:
+        if "✅" in tool_result:
+            clean_output = tool_result.replace("✅ Успешно выполнено:\n", "").strip()
+            return {"status": "success", "output": clean_output}
+        
+        clean_output = tool_result.replace("❌ Ошибка:\n", "").strip()
+        return {"status": "error", "output": clean_output}
+    
+    def _debug_messages(self, state: CommandState) -> tuple:
         retry_count = state.get("retry_count", 0) + 1
         
         if self.logger:
@@ -131,45 +242,34 @@ class CommandNode:
             error=error
         )
         
-        messages = [
+        return retry_count, [
             SystemMessage(content=prompt["system"]),
             HumanMessage(content=prompt["user"])
         ]
-        
-        response = self.llm.invoke(messages)
+    
+    def _fixed_code(self, response) -> str:
         fixed_code = clean_code_block(response.content)
         
         if self.logger:
             self.logger.code_generated(fixed_code)
         
-        tool = self.tools.get("execute_python_code")
-        if tool:
-            if self.logger:
-                self.logger.tool_start("execute_python_code", {"code": fixed_code})
-            
-            tool_result = tool.invoke({"code": fixed_code})
-            
-            if "✅" in tool_result:
-                clean_output = tool_result.replace("✅ Успешно выполнено:\n", "").strip()
-                new_result = {"status": "success", "output": clean_output}
-            else:
-                clean_output = tool_result.replace("❌ Ошибка:\n", "").strip()
-                new_result = {"status": "error", "output": clean_output}
-            
-            if self.logger:
-                success = new_result["status"] == "success"
-                self.logger.tool_end("execute_python_code", success)
-                self.logger.code_result(new_result)
-            
-            return {
-                "code": fixed_code,
-                "result": new_result,
-                "retry_count": retry_count
-            }
+        return fixed_code
+    
+    def _debugged(self, fixed_code: str, tool_result: str, retry_count: int) -> dict:
+        new_result = self._code_result(tool_result)
         
-        return {"retry_count": retry_count}
+        if self.logger:
+            success = new_result["status"] == "success"
+            self.logger.tool_end("execute_python_code", success)
+            self.logger.code_result(new_result)
+        
+        return {
+            "code": fixed_code,
+            "result": new_result,
+            "retry_count": retry_count
+        }
     
-    def review(self, state: CommandState) -> dict:
+    def _review_messages(self, state: CommandState) -> list:
         if self.logger:
             self.logger.step("Reviewing results...")
         
@@ -182,42 +282,15 @@ class CommandNode:
             result=result_output
         )
         
-        messages = [
+        return [
             SystemMessage(content=prompt["system"]),
             HumanMessage(content=prompt["user"])
         ]
-        
-        response = self.llm.invoke(messages)
+    
+    def _reviewed(self, response) -> dict:
         review = response.content
         
         if self.logger:
             self.logger.code_review(review)
         
         return {"review": review}
-    
-    def should_continue(self, state: CommandState) -> str:
-        response = state.get("response")
-        
-        if not response:
-            return "review"
-        
-        if hasattr(response, 'tool_calls') and response.tool_calls:
-            return "call_tools"
-        
-        return "review"
-    
-    def should_debug_or_review(self, state: CommandState) -> str:
-        result = state.get("result")
-        response = state.get("response")
-        retry_count = state.get("retry_count", 0)
-        
-        if result is None:
-            if response and hasattr(response, 'tool_calls') and response.tool_calls:
-                return "call_tools"
-            return "review"
-        
-        if isinstance(result, dict) and result.get("status") == "error":
-            if retry_count < 3:
-                return "debug"
-        
-        return "review"
@@ -1,18 +1,22 @@
+from typing import Union
+
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 
 from src.agents.orchestrator.state import OrchestratorState
 from src.agents.orchestrator.node import OrchestratorNode
-from src.memory import MemoryAgent
+from src.memory import MemoryAgent, NamespacedMemory
+from src.memory.server import MemoryClient
 from src.utils import AgentLogger
 
 
-def build_orchestrator_graph(analyst_graph, command_graph, cli_graph, tools: list, memory: MemoryAgent, logger: AgentLogger = None):
+def build_orchestrator_graph(analyst_graph, command_graph, cli_graph, tools: list, memory: Union[MemoryAgent, MemoryClient, NamespacedMemory], logger: AgentLogger = None):
     node = OrchestratorNode(analyst_graph, command_graph, cli_graph, tools, memory, logger)
     
     workflow = StateGraph(OrchestratorState)
     
-    workflow.add_node("analyst", node.route_to_analyst)
-    workflow.add_node("execute_agent", node.route_to_agent)
+    workflow.add_node("analyst", RunnableLambda(node.route_to_analyst, node.aroute_to_analyst))
+    workflow.add_node("execute_agent", RunnableLambda(node.route_to_agent, node.aroute_to_agent))
     workflow.add_node("finalize", node.format_final_answer)
     
     workflow.set_entry_point("analyst")
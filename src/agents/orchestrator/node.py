@@ -1,13 +1,15 @@
-from langchain_openai import ChatOpenAI
+from typing import Union
 
 from src.agents.orchestrator.state import OrchestratorState
 from src.utils import AgentLogger
-from src.memory import MemoryAgent
+from src.memory import MemoryAgent, NamespacedMemory
+from src.memory.server import MemoryClient
 from src.config import Settings
+from src.core.clients import chat_model
 
 
 class OrchestratorNode:
-    def __init__(self, analyst_graph, command_graph, cli_graph, tools: list, memory: MemoryAgent, logger: AgentLogger = None):
+    def __init__(self, analyst_graph, command_graph, cli_graph, tools: list, memory: Union[MemoryAgent, MemoryClient, NamespacedMemory], logger: AgentLogger = None):
         self.analyst = analyst_graph
         self.command_agent = command_graph
         self.cli_agent = cli_graph
@@ -15,30 +17,19 @@ class OrchestratorNode:
         self.logger = logger
         
         settings = Settings()
-        self.llm = ChatOpenAI(
-            api_key=settings.api_key,
-            base_url=settings.base_url,
-            model=settings.model,
-            temperature=0.7
-        ).bind_tools(tools)
+        self.llm = chat_model("orchestrator", 0.7, settings).bind_tools(tools)
         
         self.tools = {tool.name: tool for tool in tools}
     
     def route_to_analyst(self, state: OrchestratorState) -> dict:
-        if self.logger and state.get("iteration", 0) == 0:
-            self.logger.agent_start("Orchestrator", state["user_input"])
-        
-        if self.logger:
-            self.logger.progress("Routing to Analyst...")
-        
-        result = self.analyst.invoke({
-            "user_input": state["user_input"]
-        })
-        
-        return {
-            "analyst_decision": result["decision"],
-            "iteration": state.get("iteration", 0) + 1
-        }
+        self._log_routing(state)
+        result = self.analyst.invoke({"user_input": state["user_input"]})
+        return self._analyzed(state, result)
+    
+    async def aroute_to_analyst(self, state: OrchestratorState) -> dict:
+        self._log_routing(state)
+        result = await self.analyst.ainvoke({"user_input": state["user_input"]})
+        return self._analyzed(state, result)
     
     def route_to_agent(self, state: OrchestratorState) -> dict:
         decision = state["analyst_decision"]
@@ -50,41 +41,39 @@ class OrchestratorNode:
                 self.logger.progress("Routing to Command Agent...")
             
             result = self.command_agent.invoke({"task": task, "retry_count": 0})
-            agent_result = {
-                "agent": "command_agent",
-                "code": result["code"],
-                "result": result["result"],
-                "review": result.get("review", "")
-            }
-            
-            if self.logger:
-                self.logger.progress("Saving to memory...")
-            
-            memory_text = f"Task: {task}\nCode: {result['code']}\nResult: {result['result']}"
-            self.memory.add(memory_text, {"agent": "command_agent", "action": "code_execution"})
-            
         elif agent_name == "cli_agent":
             if self.logger:
                 self.logger.progress("Routing to CLI Agent...")
             
             result = self.cli_agent.invoke({"task": task})
-            agent_result = {
-                "agent": "cli_agent",
-                "commands": result["commands"],
-                "results": result["results"]
-            }
-            
+        else:
+            return {"agent_result": {"agent": "none", "message": task}}
+        
+        agent_result, memory_text, metadata = self._agent_result(agent_name, task, result)
+        self.memory.add(memory_text, metadata)
+        
+        return {"agent_result": agent_result}
+    
+    async def aroute_to_agent(self, state: OrchestratorState) -> dict:
+        decision = state["analyst_decision"]
+        agent_name = decision["agent"]
+        task = decision["task"]
+        
+        if agent_name == "command_agent":
             if self.logger:
-                self.logger.progress("Saving to memory...")
+                self.logger.progress("Routing to Command Agent...")
             
-            memory_text = f"Task: {task}\nCommands: {result['commands']}\nResults: {result['results']}"
-            self.memory.add(memory_text, {"agent": "cli_agent", "action": "cli_execution"})
+            result = await self.command_agent.ainvoke({"task": task, "retry_count": 0})
+        elif agent_name == "cli_agent":
+            if self.logger:
+                self.logger.progress("Routing to CLI Agent...")
             
+            result = await self.cli_agent.ainvoke({"task": task})
         else:
-            agent_result = {
-                "agent": "none",
-                "message": task
-            }
+            return {"agent_result": {"agent": "none", "message": task}}
+        
+        agent_result, memory_text, metadata = self._agent_result(agent_name, task, result)
+        await self.memory.aadd(memory_text, metadata)
         
         return {"agent_result": agent_result}
     
@@ -135,7 +124,7 @@ class OrchestratorNode:
                     
                     if review:
                         answer += f"\n📋 Ревью:\n{review}"
-                    
+            
             elif agent_result["agent"] == "cli_agent":
                 answer = "💻 Результаты выполнения CLI команд\n"
                 answer += "=" * 40 + "\n\n"
@@ -173,3 +162,40 @@ class OrchestratorNode:
             return "finish"
         
         return "continue"
+    
+    def _log_routing(self, state: OrchestratorState):
+        if self.logger and state.get("iteration", 0) == 0:
+            self.logger.agent_start("Orchestrator", state["user_input"])
+        
+        if self.logger:
+            self.logger.progress("Routing to Analyst...")
+    
+    def _analyzed(self, state: OrchestratorState, result: dict) -> dict:
+        return {
+            "analyst_decision": result["decision"],
+            "iteration": state.get("iteration", 0) + 1
+        }
+    
+    def _agent_result(self, agent_name: str, task: str, result: dict) -> tuple:
+        if agent_name == "command_agent":
+            agent_result = {
+                "agent": "command_agent",
+                "code": result["code"],
+                "result": result["result"],
+                "review": result.get("review", "")
+            }
+            memory_text = f"Task: {task}\nCode: {result['code']}\nResult: {result['result']}"
+            metadata = {"agent": "command_agent", "action": "code_execution"}
+        else:
+            agent_result = {
+                "agent": "cli_agent",
+                "commands": result["commands"],
+                "results": result["results"]
+            }
+            memory_text = f"Task: {task}\nCommands: {result['commands']}\nResults: {result['results']}"
+            metadata = {"agent": "cli_agent", "action": "cli_execution"}
+        
+        if self.logger:
+            self.logger.progress("Saving to memory...")
+        
+        return agent_result, memory_text, metadata
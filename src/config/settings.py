@@ -11,6 +11,73 @@ class Settings:
     base_url: str = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
     model: str = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
     tavily_api_key: str = os.getenv("TAVILY_API_KEY", "")
+    http_timeout: float = float(os.getenv("HTTP_TIMEOUT", "60"))
+    http_connect_timeout: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    http_max_keepalive: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+    http_keepalive_expiry: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    http2: bool = os.getenv("HTTP2", "true").lower() == "true"
+    llm_streaming: bool = os.getenv("LLM_STREAMING", "true").lower() == "true"
+    llm_cache: bool = os.getenv("LLM_CACHE", "false").lower() == "true"
+    llm_cache_path: str = os.getenv("LLM_CACHE_PATH", "")
+    llm_cache_size: int = int(os.getenv("LLM_CACHE_SIZE", "1000"))
+    llm_cache_ttl: float = float(os.getenv("LLM_CACHE_TTL", "0"))
+    llm_cache_nodes: str = os.getenv("LLM_CACHE_NODES", "")
+    llm_cache_max_temperature: float = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "2"))
+    code_timeout: float = float(os.getenv("CODE_TIMEOUT", "30"))
+    tool_workers: int = int(os.getenv("TOOL_WORKERS", "4"))
+    tool_serial: str = os.getenv("TOOL_SERIAL", "execute_shell_command,execute_python_code")
+    embedder: str = os.getenv("EMBEDDER", "api")
     embedding_model: str = os.getenv("EMBEDDING_MODEL", "qwen/qwen3-embedding-8b")
     embedding_dim: int = int(os.getenv("EMBEDDING_DIM", "4096"))
+    embedding_onnx_path: str = os.getenv("EMBEDDING_ONNX_PATH", "")
+    embedding_cache_size: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+    embedding_cache_path: str = os.getenv("EMBEDDING_CACHE_PATH", "")
+    embedding_cache_max_mb: int = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "512"))
+    embedding_cache_memory_mb: int = int(os.getenv("EMBEDDING_CACHE_MEMORY_MB", "64"))
+    memory_dir: str = os.getenv("MEMORY_DIR", "")
+    memory_snapshot_every: int = int(os.getenv("MEMORY_SNAPSHOT_EVERY", "1000"))
+    memory_on_disk: bool = os.getenv("MEMORY_ON_DISK", "false").lower() == "true"
+    memory_write_behind: bool = os.getenv("MEMORY_WRITE_BEHIND", "false").lower() == "true"
+    memory_batch_size: int = int(os.getenv("MEMORY_BATCH_SIZE", "32"))
+    memory_flush_interval: float = float(os.getenv("MEMORY_FLUSH_INTERVAL", "1.0"))
+    memory_index: str = os.getenv("MEMORY_INDEX", "flat")
+    memory_index_threshold: int = int(os.getenv("MEMORY_INDEX_THRESHOLD", "50000"))
+    memory_hnsw_m: int = int(os.getenv("MEMORY_HNSW_M", "32"))
+    memory_ef_search: int = int(os.getenv("MEMORY_EF_SEARCH", "64"))
+    memory_ivf_nlist: int = int(os.getenv("MEMORY_IVF_NLIST", "0"))
+    memory_pq_m: int = int(os.getenv("MEMORY_PQ_M", "64"))
+    memory_nprobe: int = int(os.getenv("MEMORY_NPROBE", "16"))
+    memory_shards: int = int(os.getenv("MEMORY_SHARDS", "1"))
+    memory_shard_capacity: int = int(os.getenv("MEMORY_SHARD_CAPACITY", "0"))
+    memory_storage: str = os.getenv("MEMORY_STORAGE", "float32")
+    memory_reduce: str = os.getenv("MEMORY_REDUCE", "none")
+    memory_reduce_dim: int = int(os.getenv("MEMORY_REDUCE_DIM", "0"))
+    memory_ttl_seconds: int = int(os.getenv("MEMORY_TTL_SECONDS", "0"))
+    memory_max_entries: int = int(os.getenv("MEMORY_MAX_ENTRIES", "0"))
+    memory_evict_batch: int = int(os.getenv("MEMORY_EVICT_BATCH", "100"))
+    memory_dedup: bool = os.getenv("MEMORY_DEDUP", "false").lower() == "true"
+    memory_dedup_distance: float = float(os.getenv("MEMORY_DEDUP_DISTANCE", "0.05"))
+    memory_chunking: str = os.getenv("MEMORY_CHUNKING", "none")
+    memory_chunk_tokens: int = int(os.getenv("MEMORY_CHUNK_TOKENS", "256"))
+    memory_chunk_overlap: int = int(os.getenv("MEMORY_CHUNK_OVERLAP", "32"))
+    memory_search_mode: str = os.getenv("MEMORY_SEARCH_MODE", "vector")
+    memory_max_distance: float = float(os.getenv("MEMORY_MAX_DISTANCE", "0"))
+    memory_adaptive_k: bool = os.getenv("MEMORY_ADAPTIVE_K", "false").lower() == "true"
+    memory_score_gap: float = float(os.getenv("MEMORY_SCORE_GAP", "0.15"))
+    memory_rrf_k: int = int(os.getenv("MEMORY_RRF_K", "60"))
+    memory_max_namespaces: int = int(os.getenv("MEMORY_MAX_NAMESPACES", "32"))
+    memory_namespace_idle: float = float(os.getenv("MEMORY_NAMESPACE_IDLE", "600"))
+    memory_compact_age: int = int(os.getenv("MEMORY_COMPACT_AGE", "604800"))
+    memory_compact_cluster_size: int = int(os.getenv("MEMORY_COMPACT_CLUSTER_SIZE", "8"))
+    memory_compact_budget: int = int(os.getenv("MEMORY_COMPACT_BUDGET", "500"))
+    memory_compact_max_summaries: int = int(os.getenv("MEMORY_COMPACT_MAX_SUMMARIES", "10"))
+    memory_compact_time_budget: float = float(os.getenv("MEMORY_COMPACT_TIME_BUDGET", "60"))
+    memory_compact_interval: float = float(os.getenv("MEMORY_COMPACT_INTERVAL", "0"))
+    memory_server_address: str = os.getenv("MEMORY_SERVER_ADDRESS", "")
+    memory_server_authkey: str = os.getenv("MEMORY_SERVER_AUTHKEY", "")
+    memory_server_authkey_file: str = os.getenv("MEMORY_SERVER_AUTHKEY_FILE", os.path.expanduser("~/.jarvis/memory_server.key"))
+    memory_server_allow_remote: bool = os.getenv("MEMORY_SERVER_ALLOW_REMOTE", "false").lower() == "true"
+    ingest_batch_size: int = int(os.getenv("INGEST_BATCH_SIZE", "256"))
+    ingest_workers: int = int(os.getenv("INGEST_WORKERS", "4"))
     max_retries: int = 2
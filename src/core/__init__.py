@@ -1,5 +1,20 @@
 from .llm import LLMClient
 from .executor import CodeExecutor
 from .cli_executor import CLIExecutor
+from .llm_cache import LLMResponseCache, llm_cache
+from .clients import http_client, async_http_client, openai_client, async_openai_client, chat_model, close_clients, aclose_clients
 
-__all__ = ["LLMClient", "CodeExecutor", "CLIExecutor"]
+__all__ = [
+    "LLMClient",
+    "CodeExecutor",
+    "CLIExecutor",
+    "LLMResponseCache",
+    "llm_cache",
+    "http_client",
+    "async_http_client",
+    "openai_client",
+    "async_openai_client",
+    "chat_model",
+    "close_clients",
+    "aclose_clients"
+]
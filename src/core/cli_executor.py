@@ -1,7 +1,10 @@
+import asyncio
 import subprocess
 
 
 class CLIExecutor:
+    TIMEOUT = 30
+    
     def run(self, command: str) -> dict:
         try:
             result = subprocess.run(
@@ -9,7 +12,7 @@ class CLIExecutor:
                 shell=True,
                 capture_output=True,
                 text=True,
-                timeout=30
+                timeout=self.TIMEOUT
             )
             
             return {
@@ -19,16 +22,46 @@ class CLIExecutor:
                 "returncode": result.returncode
             }
         except subprocess.TimeoutExpired:
-            return {
-                "status": "error",
-                "stdout": "",
-                "stderr": "Command timeout (30s)",
-                "returncode": -1
-            }
+            return self._timeout()
         except Exception as e:
+            return self._failure(e)
+    
+    async def arun(self, command: str) -> dict:
+        try:
+            process = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=self.TIMEOUT)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                return self._timeout()
+            
             return {
-                "status": "error",
-                "stdout": "",
-                "stderr": str(e),
-                "returncode": -1
+                "status": "success" if process.returncode == 0 else "error",
+                "stdout": stdout.decode(errors="replace"),
+                "stderr": stderr.decode(errors="replace"),
+                "returncode": process.returncode
             }
+        except Exception as e:
+            return self._failure(e)
+    
+    def _timeout(self) -> dict:
+        return {
+            "status": "error",
+            "stdout": "",
+            "stderr": f"Command timeout ({self.TIMEOUT}s)",
+            "returncode": -1
+        }
+    
+    def _failure(self, error: Exception) -> dict:
+        return {
+            "status": "error",
+            "stdout": "",
+            "stderr": str(error),
+            "returncode": -1
+        }
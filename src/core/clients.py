@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import weakref
+from importlib.util import find_spec
+
+import httpx
+from langchain_openai import ChatOpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from src.config import Settings
+from src.core.llm_cache import llm_cache
+
+
+_lock = threading.Lock()
+_http_clients = {}
+_openai_clients = {}
+
+
+class LoopLocalTransport(httpx.AsyncBaseTransport):
+    def __init__(self, **options):
+        self.options = options
+        self.transports = weakref.WeakKeyDictionary()
+        self.lock = threading.Lock()
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            transport = self.transports.get(loop)
+            if transport is None:
+                transport = self.transports[loop] = httpx.AsyncHTTPTransport(**self.options)
+        return await transport.handle_async_request(request)
+    
+    async def aclose(self):
+        current = asyncio.get_running_loop()
+        for loop, transport in self._drain():
+            if loop is current:
+                await transport.aclose()
+            elif loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(transport.aclose(), loop))
+    
+    def close(self):
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        
+        for loop, transport in self._drain():
+            if loop is current:
+                loop.create_task(transport.aclose())
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(transport.aclose(), loop).result()
+            elif not loop.is_closed() and current is None:
+                loop.run_until_complete(transport.aclose())
+    
+    def _drain(self) -> list[tuple]:
+        with self.lock:
+            transports = list(self.transports.items())
+            self.transports.clear()
+        return transports
+
+
+def http_options(settings: Settings = None) -> dict:
+    settings = settings or Settings()
+    return {
+        "http2": settings.http2 and find_spec("h2") is not None,
+        "timeout": httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
+        "limits": httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive,
+            keepalive_expiry=settings.http_keepalive_expiry
+        )
+    }
+
+
+def http_client(settings: Settings = None) -> httpx.Client:
+    with _lock:
+        client = _http_clients.get("sync")
+        if client is None or client.is_closed:
+            client = _http_clients["sync"] = httpx.Client(**http_options(settings))
+        return client
+
+
+def async_http_client(settings: Settings = None) -> httpx.AsyncClient:
+    with _lock:
+        client = _http_clients.get("async")
+        if client is None or client.is_closed:
+            options = http_options(settings)
+            timeout = options.pop("timeout")
+            transport = _http_clients["async_transport"] = LoopLocalTransport(**options)
+            client = _http_clients["async"] = httpx.AsyncClient(timeout=timeout, transport=transport)
+        return client
+
+
+def openai_client(settings: Settings = None) -> OpenAI:
+    settings = settings or Settings()
+    key = (settings.api_key, settings.base_url)
+    
+    with _lock:
+        client = _openai_clients.get(key)
+        if client is not None:
+            return client
+    
+    client = OpenAI(
+        api_key=settings.api_key,
+        base_url=settings.base_url,
+        max_retries=settings.max_retries,
+        http_client=http_client(settings)
+    )
+    
+    with _lock:
+        return _openai_clients.setdefault(key, client)
+
+
+def async_openai_client(settings: Settings = None) -> AsyncOpenAI:
+    settings = settings or Settings()
+    key = ("async", settings.api_key, settings.base_url)
+    
+    with _lock:
+        client = _openai_clients.get(key)
+        if client is not None:
+            return client
+    
+    client = AsyncOpenAI(
+        api_key=settings.api_key,
+        base_url=settings.base_url,
+        max_retries=settings.max_retries,
+        http_client=async_http_client(settings)
+    )
+    
+    with _lock:
+        return _openai_clients.setdefault(key, client)
+
+
+def chat_model(node: str, temperature: float = 0.7, settings: Settings = None) -> ChatOpenAI:
+    settings = settings or Settings()
+    return ChatOpenAI(
+        api_key=settings.api_key,
+        base_url=settings.base_url,
+        model=settings.model,
+        temperature=temperature,
+        max_retries=settings.max_retries,
+        streaming=settings.llm_streaming,
+        cache=llm_cache(node, temperature, settings),
+        http_client=http_client(settings),
+        http_async_client=async_http_client(settings)
+    )
+
+
+def close_clients():
+    for client in _take_clients():
+        if isinstance(client, (httpx.Client, LoopLocalTransport)):
+            client.close()
+
+
+async def aclose_clients():
+    for client in _take_clients():
+        if isinstance(client, httpx.AsyncClient):
+            await client.aclose()
+        elif isinstance(client, httpx.Client):
+            client.close()
+
+
+def _take_clients() -> list:
+    with _lock:
+        clients = list(_http_clients.values())
+        _http_clients.clear()
+        _openai_clients.clear()
+    return clients
@@ -1,38 +1,81 @@
+import asyncio
+import os
+import subprocess
 import sys
 import traceback
-from io import StringIO
+
+from src.config import Settings
 
 
 class CodeExecutor:
+    def __init__(self, timeout: float = None):
+        self.timeout = timeout or Settings().code_timeout
+    
     def run(self, code: str) -> dict:
-        old_stdout = sys.stdout
-        old_stderr = sys.stderr
-        
-        stdout_capture = StringIO()
-        stderr_capture = StringIO()
-        
-        sys.stdout = stdout_capture
-        sys.stderr = stderr_capture
+        try:
+            result = subprocess.run(
+                [sys.executable, "-"],
+                input=code,
+                capture_output=True,
+                encoding="utf-8",
+                errors="replace",
+                env=self._env(),
+                timeout=self.timeout
+            )
+        except subprocess.TimeoutExpired:
+            return self._timeout()
+        except Exception:
+            return {"status": "error", "traceback": traceback.format_exc()}
         
+        return self._result(result.returncode, result.stdout, result.stderr)
+    
+    async def arun(self, code: str) -> dict:
         try:
-            exec(code, {"__builtins__": __builtins__}, {})
-            
-            stdout_output = stdout_capture.getvalue()
-            stderr_output = stderr_capture.getvalue()
-            
-            output = stdout_output
-            if stderr_output:
-                output += f"\n[stderr]: {stderr_output}"
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=self._env()
+            )
             
-            return {
-                "status": "success",
-                "output": output.strip() if output.strip() else "Код выполнен успешно (нет вывода)"
-            }
-        except Exception as e:
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(code.encode("utf-8")), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                return self._timeout()
+        except Exception:
+            return {"status": "error", "traceback": traceback.format_exc()}
+        
+        return self._result(
+            process.returncode,
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace")
+        )
+    
+    def _env(self) -> dict:
+        return {**os.environ, "PYTHONIOENCODING": "utf-8"}
+    
+    def _result(self, returncode: int, stdout: str, stderr: str) -> dict:
+        if returncode != 0:
             return {
                 "status": "error",
-                "traceback": traceback.format_exc()
+                "traceback": stderr.strip() or f"Процесс завершился с кодом {returncode}"
             }
-        finally:
-            sys.stdout = old_stdout
-            sys.stderr = old_stderr
+        
+        output = stdout
+        if stderr:
+            output += f"\n[stderr]: {stderr}"
+        
+        return {
+            "status": "success",
+            "output": output.strip() if output.strip() else "Код выполнен успешно (нет вывода)"
+        }
+    
+    def _timeout(self) -> dict:
+        return {
+            "status": "error",
+            "traceback": f"Превышено время выполнения кода ({self.timeout:g}s)"
+        }
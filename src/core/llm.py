@@ -1,14 +1,10 @@
-from openai import OpenAI
-
 from src.config import Settings
+from src.core.clients import openai_client
 
 
 class LLMClient:
     def __init__(self, settings: Settings):
-        self.client = OpenAI(
-            api_key=settings.api_key,
-            base_url=settings.base_url
-        )
+        self.client = openai_client(settings)
         self.model = settings.model
     
     def chat(self, system: str, user: str, temperature: float = 0.7) -> str:
@@ -0,0 +1,126 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Union
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+from src.config import Settings
+
+
+class LLMResponseCache(BaseCache):
+    def __init__(self, max_items: int = 1000, path: str = "", ttl: float = 0):
+        self.max_items = max_items
+        self.ttl = ttl
+        self.lru = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self.db = None
+        
+        if path:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS llm_responses_created ON llm_responses (created)")
+            self.db.commit()
+    
+    @staticmethod
+    def key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+    
+    def lookup(self, prompt: str, llm_string: str) -> Optional[list]:
+        key = self.key(prompt, llm_string)
+        now = time.time()
+        
+        with self.lock:
+            entry = self.lru.get(key)
+            if entry is not None and not self._expired(entry[1], now):
+                self.lru.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return entry[0]
+            
+            if self.db is not None:
+                row = self.db.execute("SELECT value, created FROM llm_responses WHERE key = ?", (key,)).fetchone()
+                if row is not None and not self._expired(row[1], now):
+                    generations = loads(row[0], allowed_objects="core")
+                    self._remember(key, generations, row[1])
+                    self.stats["disk_hits"] += 1
+                    return generations
+            
+            self.stats["misses"] += 1
+            return None
+    
+    def update(self, prompt: str, llm_string: str, return_val: list):
+        key = self.key(prompt, llm_string)
+        now = time.time()
+        
+        with self.lock:
+            self._remember(key, return_val, now)
+            
+            if self.db is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, value, created) VALUES (?, ?, ?)",
+                    (key, dumps(return_val), now)
+                )
+                if self.ttl:
+                    self.db.execute("DELETE FROM llm_responses WHERE created < ?", (now - self.ttl,))
+                self.db.commit()
+    
+    def clear(self, **kwargs):
+        with self.lock:
+            self.lru.clear()
+            if self.db is not None:
+                self.db.execute("DELETE FROM llm_responses")
+                self.db.commit()
+    
+    def info(self) -> dict:
+        with self.lock:
+            info = dict(self.stats)
+            info["memory_items"] = len(self.lru)
+            if self.db is not None:
+                info["disk_items"] = self.db.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        
+        lookups = info["memory_hits"] + info["disk_hits"] + info["misses"]
+        info["hit_rate"] = (info["memory_hits"] + info["disk_hits"]) / lookups if lookups else 0.0
+        return info
+    
+    def _expired(self, created: float, now: float) -> bool:
+        return bool(self.ttl) and now - created > self.ttl
+    
+    def _remember(self, key: str, generations: list, created: float):
+        self.lru[key] = (generations, created)
+        self.lru.move_to_end(key)
+        while len(self.lru) > self.max_items:
+            self.lru.popitem(last=False)
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def llm_cache(node: str, temperature: float, settings: Settings = None) -> Optional[Union[LLMResponseCache, bool]]:
+    global _shared_cache
+    settings = settings or Settings()
+    
+    if not settings.llm_cache:
+        return None
+    
+    nodes = [name.strip() for name in settings.llm_cache_nodes.split(",") if name.strip()]
+    if nodes and node not in nodes:
+        return False
+    if temperature > settings.llm_cache_max_temperature:
+        return False
+    
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMResponseCache(
+                max_items=settings.llm_cache_size,
+                path=settings.llm_cache_path,
+                ttl=settings.llm_cache_ttl
+            )
+        return _shared_cache
@@ -1,4 +1,5 @@
-from src.memory import MemoryAgent
+from src.memory import use_namespace
+from src.memory.server import create_memory
 from src.utils import AgentLogger
 from src.tools import (
     CodeExecutorTool,
@@ -18,7 +19,7 @@ class JARVIS:
         self.verbose = verbose
         self.logger = AgentLogger() if verbose else None
         
-        self.memory = MemoryAgent()
+        self.memory = create_memory()
         
         code_tool = CodeExecutorTool()
         cli_tool = CLIExecutorTool()
@@ -44,21 +45,41 @@ class JARVIS:
             self.logger
         )
     
-    def run(self, task: str) -> str:
+    def run(self, task: str, namespace: str = None) -> str:
+        self._announce(task, namespace)
+        
+        with use_namespace(namespace):
+            result = self.orchestrator.invoke(self._initial_state(task))
+        
+        return self._finish(result)
+    
+    async def arun(self, task: str, namespace: str = None) -> str:
+        self._announce(task, namespace)
+        
+        with use_namespace(namespace):
+            result = await self.orchestrator.ainvoke(self._initial_state(task))
+        
+        return self._finish(result)
+    
+    def _announce(self, task: str, namespace: str = None):
         if self.verbose:
             print(f"\n{'='*80}")
             print(f"🚀 JARVIS запущен")
             print(f"📋 Задача: {task}")
+            if namespace:
+                print(f"🗂️ Пространство памяти: {namespace}")
             print(f"{'='*80}\n")
-        
-        result = self.orchestrator.invoke({
+    
+    def _initial_state(self, task: str) -> dict:
+        return {
             "user_input": task,
             "analyst_decision": None,
             "agent_result": None,
             "final_answer": "",
             "iteration": 0
-        })
-        
+        }
+    
+    def _finish(self, result: dict) -> str:
         final_answer = result.get("final_answer", "Нет результата")
         
         if self.verbose:
@@ -1,4 +1,32 @@
 from .memory_agent import MemoryAgent
-from .embedder import APIEmbedder
+from .embedder import (
+    BaseEmbedder,
+    APIEmbedder,
+    HashingEmbedder,
+    ONNXEmbedder,
+    create_embedder,
+    register_embedder
+)
+from .cache import EmbeddingCache
+from .index import VectorIndex, ShardedIndex, create_index, recall_report
+from .namespaces import NamespacedMemory, current_namespace, use_namespace
+from .compaction import MemoryCompactor
 
-__all__ = ["MemoryAgent", "APIEmbedder"]
+__all__ = [
+    "MemoryAgent",
+    "BaseEmbedder",
+    "APIEmbedder",
+    "HashingEmbedder",
+    "ONNXEmbedder",
+    "create_embedder",
+    "register_embedder",
+    "EmbeddingCache",
+    "VectorIndex",
+    "ShardedIndex",
+    "create_index",
+    "recall_report",
+    "NamespacedMemory",
+    "current_namespace",
+    "use_namespace",
+    "MemoryCompactor"
+]
@@ -0,0 +1,132 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        max_items: int = 10000,
+        path: str = "",
+        max_bytes: int = 512 * 1024 * 1024,
+        memory_bytes: int = 64 * 1024 * 1024
+    ):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.lru = OrderedDict()
+        self.lru_bytes = 0
+        self.lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self.db = None
+        
+        if path:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+            self.db.commit()
+    
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model}:{digest}"
+    
+    def get_many(self, model: str, texts: list[str]) -> list:
+        keys = [self.key(model, text) for text in texts]
+        found = [None] * len(keys)
+        disk_lookup = []
+        
+        with self.lock:
+            for i, key in enumerate(keys):
+                if key in self.lru:
+                    self.lru.move_to_end(key)
+                    found[i] = self.lru[key]
+                    self.stats["memory_hits"] += 1
+                else:
+                    disk_lookup.append(i)
+            
+            if self.db is not None and disk_lookup:
+                now = time.time()
+                for i in disk_lookup:
+                    row = self.db.execute(
+                        "SELECT vector FROM embeddings WHERE key = ?", (keys[i],)
+                    ).fetchone()
+                    if row is None:
+                        continue
+                    
+                    vector = np.frombuffer(row[0], dtype=np.float32)
+                    found[i] = vector
+                    self._remember(keys[i], vector)
+                    self.db.execute("UPDATE embeddings SET last_used = ? WHERE key = ?", (now, keys[i]))
+                    self.stats["disk_hits"] += 1
+                self.db.commit()
+            
+            self.stats["misses"] += sum(1 for vector in found if vector is None)
+        
+        return found
+    
+    def put_many(self, model: str, texts: list[str], vectors: np.ndarray):
+        with self.lock:
+            rows = []
+            now = time.time()
+            for text, vector in zip(texts, vectors):
+                key = self.key(model, text)
+                vector = np.ascontiguousarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                rows.append((key, vector.tobytes(), vector.nbytes, now))
+            
+            if self.db is not None and rows:
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, size, last_used) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                self._evict_disk()
+                self.db.commit()
+    
+    def info(self) -> dict:
+        with self.lock:
+            info = dict(self.stats)
+            info["memory_items"] = len(self.lru)
+            info["memory_bytes"] = self.lru_bytes
+            if self.db is not None:
+                count, size = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM embeddings").fetchone()
+                info["disk_items"] = count
+                info["disk_bytes"] = size
+        
+        lookups = info["memory_hits"] + info["disk_hits"] + info["misses"]
+        info["hit_rate"] = (info["memory_hits"] + info["disk_hits"]) / lookups if lookups else 0.0
+        return info
+    
+    def _remember(self, key: str, vector: np.ndarray):
+        previous = self.lru.pop(key, None)
+        if previous is not None:
+            self.lru_bytes -= previous.nbytes
+        
+        self.lru[key] = vector
+        self.lru_bytes += vector.nbytes
+        while self.lru and (len(self.lru) > self.max_items or self.lru_bytes > self.memory_bytes):
+            _, evicted = self.lru.popitem(last=False)
+            self.lru_bytes -= evicted.nbytes
+    
+    def _evict_disk(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in self.db.execute("SELECT key, size FROM embeddings ORDER BY last_used"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        
+        self.db.executemany("DELETE FROM embeddings WHERE key = ?", victims)
@@ -0,0 +1,58 @@
+import re
+
+
+FIELD_PATTERN = re.compile(r"^(Task|Code|Result|Results|Commands|Review):[ \t]*", re.MULTILINE)
+
+
+def split_fields(text: str) -> list[tuple]:
+    matches = list(FIELD_PATTERN.finditer(text))
+    if not matches:
+        return [(None, text)]
+    
+    fields = []
+    if text[:matches[0].start()].strip():
+        fields.append((None, text[:matches[0].start()].strip()))
+    
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        body = text[match.end():end].strip()
+        if body:
+            fields.append((match.group(1), body))
+    
+    return fields
+
+
+def split_window(text: str, size: int, overlap: int) -> list[str]:
+    tokens = text.split()
+    if len(tokens) <= size:
+        return [text]
+    
+    step = max(1, size - overlap)
+    windows = []
+    for start in range(0, len(tokens), step):
+        windows.append(" ".join(tokens[start:start + size]))
+        if start + size >= len(tokens):
+            break
+    
+    return windows
+
+
+def chunk_text(text: str, mode: str = "fields", size: int = 256, overlap: int = 32) -> list[dict]:
+    if mode == "none":
+        return [{"field": None, "text": text}]
+    
+    if mode == "window":
+        return [{"field": None, "text": window} for window in split_window(text, size, overlap)]
+    
+    if mode != "fields":
+        raise ValueError(f"Unknown chunking mode: {mode}")
+    
+    chunks = []
+    for field, body in split_fields(text):
+        for window in split_window(body, size, overlap):
+            chunks.append({
+                "field": field,
+                "text": f"{field}: {window}" if field else window
+            })
+    
+    return chunks or [{"field": None, "text": text}]
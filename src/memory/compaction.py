@@ -0,0 +1,156 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import faiss
+import numpy as np
+from langchain_core.messages import SystemMessage, HumanMessage
+
+from src.config import Settings
+from src.core.clients import chat_model
+from src.prompts import PromptLoader
+
+
+class MemoryCompactor:
+    MAX_ENTRY_CHARS = 1500
+    
+    def __init__(self, memory, llm=None, settings: Settings = None):
+        settings = settings or memory.settings
+        self.settings = settings
+        self.memory = memory
+        self.llm = llm or chat_model("compactor", 0.3, settings)
+        self.prompts = PromptLoader()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.errors = []
+    
+    def start(self, interval: float = None) -> threading.Thread:
+        interval = interval or self.settings.memory_compact_interval
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, args=(interval,), daemon=True)
+        self.thread.start()
+        return self.thread
+    
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+    
+    def compact(self) -> dict:
+        start = time.perf_counter()
+        stats = {"entries": 0, "clusters": 0, "summaries": 0, "removed": 0}
+        
+        units = self._candidates()
+        cluster_size = max(2, self.settings.memory_compact_cluster_size)
+        if len(units) < cluster_size:
+            return stats
+        
+        unit_ids = list(units)
+        vectors = self._unit_vectors([units[unit_id]["chunks"] for unit_id in unit_ids])
+        clusters = self._cluster(vectors, len(unit_ids) // cluster_size)
+        stats["entries"] = len(unit_ids)
+        stats["clusters"] = len(clusters)
+        
+        for members in clusters:
+            if stats["summaries"] >= self.settings.memory_compact_max_summaries:
+                break
+            if time.perf_counter() - start > self.settings.memory_compact_time_budget:
+                break
+            if len(members) < 2:
+                continue
+            
+            group = [unit_ids[i] for i in members]
+            self._summarize(group, units)
+            stats["summaries"] += 1
+            stats["removed"] += self.memory.remove(group)
+        
+        return stats
+    
+    def _candidates(self) -> dict:
+        cutoff = (datetime.now() - timedelta(seconds=self.settings.memory_compact_age)).isoformat()
+        units = {}
+        
+        self.memory.ensure_indexes()
+        with self.memory.lock.read():
+            for idx in self.memory.metadata_index.oldest():
+                if len(units) >= self.settings.memory_compact_budget:
+                    break
+                
+                chunk = self.memory.store[idx]
+                if chunk["timestamp"] >= cutoff:
+                    break
+                if chunk["metadata"].get("action") == "summary":
+                    continue
+                
+                parent_id = chunk.get("parent_id")
+                if parent_id is None:
+                    units[idx] = {"text": chunk["text"], "timestamp": chunk["timestamp"], "chunks": [idx]}
+                    continue
+                
+                unit = units.get(parent_id)
+                if unit is None:
+                    parent = self.memory.parents[parent_id]
+                    unit = units[parent_id] = {"text": parent["text"], "timestamp": parent["timestamp"], "chunks": []}
+                unit["chunks"].append(idx)
+        
+        return units
+    
+    def _unit_vectors(self, chunk_groups: list[list[int]]) -> np.ndarray:
+        chunk_ids = [idx for chunks in chunk_groups for idx in chunks]
+        with self.memory.lock.write():
+            vectors = self.memory.index.reconstruct(chunk_ids)
+        
+        offsets = np.cumsum([0] + [len(chunks) for chunks in chunk_groups])
+        return np.stack([
+            vectors[offsets[i]:offsets[i + 1]].mean(axis=0)
+            for i in range(len(chunk_groups))
+        ]).astype(np.float32)
+    
+    def _cluster(self, vectors: np.ndarray, k: int) -> list[list[int]]:
+        k = max(1, k)
+        if k == 1:
+            return [list(range(len(vectors)))]
+        
+        kmeans = faiss.Kmeans(vectors.shape[1], k, niter=20, seed=1234, min_points_per_centroid=1)
+        kmeans.train(vectors)
+        _, assignment = kmeans.index.search(vectors, 1)
+        
+        clusters = {}
+        for i, cluster in enumerate(assignment[:, 0]):
+            clusters.setdefault(int(cluster), []).append(i)
+        
+        return sorted(clusters.values(), key=len, reverse=True)
+    
+    def _summarize(self, group: list[int], units: dict) -> list[int]:
+        members = [units[unit_id] for unit_id in group]
+        entries = "\n\n".join(
+            f"[{i + 1}] {member['text'][:self.MAX_ENTRY_CHARS]}"
+            for i, member in enumerate(members)
+        )
+        
+        prompt = self.prompts.format("memory_compactor", count=len(members), entries=entries)
+        response = self.llm.invoke([
+            SystemMessage(content=prompt["system"]),
+            HumanMessage(content=prompt["user"])
+        ])
+        
+        timestamps = sorted(member["timestamp"] for member in members)
+        metadata = {
+            "agent": "compactor",
+            "action": "summary",
+            "compacted": len(members),
+            "compacted_from": timestamps[0],
+            "compacted_to": timestamps[-1]
+        }
+        
+        entries, pieces = self.memory.prepare([response.content], [metadata], [timestamps[-1]])
+        embs = self.memory.embedder.encode([piece["text"] for piece, parent in pieces])
+        return self.memory.add_embedded(entries, pieces, embs)
+    
+    def _loop(self, interval: float):
+        while not self.stop_event.wait(interval):
+            try:
+                self.compact()
+            except Exception as e:
+                self.errors.append(e)
@@ -0,0 +1,102 @@
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+
+
+class SqliteChunkStore(MutableMapping):
+    def __init__(self, path: str, cache_size: int = 10000):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, data TEXT NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS chunks_timestamp ON chunks (timestamp)")
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+    
+    def __getitem__(self, key: int) -> dict:
+        key = int(key)
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key]
+            
+            row = self.db.execute("SELECT data FROM chunks WHERE id = ?", (key,)).fetchone()
+            if row is None:
+                raise KeyError(key)
+            
+            chunk = json.loads(row[0])
+            self._remember(key, chunk)
+            return chunk
+    
+    def __setitem__(self, key: int, chunk: dict):
+        self.update({key: chunk})
+    
+    def __delitem__(self, key: int):
+        key = int(key)
+        with self.lock:
+            cursor = self.db.execute("DELETE FROM chunks WHERE id = ?", (key,))
+            self.cache.pop(key, None)
+            if cursor.rowcount == 0:
+                raise KeyError(key)
+    
+    def __contains__(self, key) -> bool:
+        try:
+            key = int(key)
+        except (TypeError, ValueError):
+            return False
+        
+        with self.lock:
+            if key in self.cache:
+                return True
+            return self.db.execute("SELECT 1 FROM chunks WHERE id = ?", (key,)).fetchone() is not None
+    
+    def __len__(self) -> int:
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+    
+    def __iter__(self):
+        with self.lock:
+            ids = [row[0] for row in self.db.execute("SELECT id FROM chunks ORDER BY timestamp, id")]
+        return iter(ids)
+    
+    def update(self, items=(), **kwargs):
+        items = dict(items)
+        rows = [
+            (int(key), chunk["timestamp"], json.dumps(chunk, ensure_ascii=False, separators=(",", ":")))
+            for key, chunk in items.items()
+        ]
+        
+        with self.lock:
+            self.db.execute("BEGIN")
+            self.db.executemany("INSERT OR REPLACE INTO chunks (id, timestamp, data) VALUES (?, ?, ?)", rows)
+            self.db.execute("COMMIT")
+            for key, chunk in items.items():
+                self._remember(int(key), chunk)
+    
+    def stream(self, batch_size: int = 1000):
+        cursor = self.db.cursor()
+        cursor.execute("SELECT data FROM chunks ORDER BY timestamp, id")
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield json.loads(row[0])
+    
+    def close(self):
+        self.db.close()
+    
+    def _remember(self, key: int, chunk: dict):
+        self.cache[key] = chunk
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
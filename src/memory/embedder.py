@@ -1,22 +1,87 @@
+import asyncio
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+
 import numpy as np
-from openai import OpenAI
 
 from src.config import Settings
+from src.core.clients import async_openai_client, openai_client
+from src.memory.cache import EmbeddingCache
+from src.memory.lexical import tokenize
 
 
-class APIEmbedder:
-    def __init__(self):
-        settings = Settings()
-        self.client = OpenAI(
-            api_key=settings.api_key,
-            base_url=settings.base_url
-        )
+class BaseEmbedder(ABC):
+    use_cache = True
+    
+    def __init__(self, settings: Settings = None):
+        settings = settings or Settings()
+        self.settings = settings
         self.model = settings.embedding_model
+        self.cache = None
+        
+        if self.use_cache:
+            self.cache = EmbeddingCache(
+                max_items=settings.embedding_cache_size,
+                path=settings.embedding_cache_path,
+                max_bytes=settings.embedding_cache_max_mb * 1024 * 1024,
+                memory_bytes=settings.embedding_cache_memory_mb * 1024 * 1024
+            )
     
     def encode(self, texts: list[str]) -> np.ndarray:
         if isinstance(texts, str):
             texts = [texts]
         
+        if self.cache is None:
+            return self._embed(texts)
+        
+        vectors, missing = self._cached(texts)
+        if missing:
+            vectors = self._fill(texts, vectors, missing, self._embed(missing))
+        
+        return np.array(vectors, dtype=np.float32)
+    
+    async def aencode(self, texts: list[str]) -> np.ndarray:
+        if isinstance(texts, str):
+            texts = [texts]
+        
+        if self.cache is None:
+            return await self._aembed(texts)
+        
+        vectors, missing = self._cached(texts)
+        if missing:
+            vectors = self._fill(texts, vectors, missing, await self._aembed(missing))
+        
+        return np.array(vectors, dtype=np.float32)
+    
+    def cache_info(self) -> dict:
+        return self.cache.info() if self.cache is not None else {}
+    
+    def _cached(self, texts: list[str]) -> tuple[list, list[str]]:
+        vectors = self.cache.get_many(self.model, texts)
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        return vectors, missing
+    
+    def _fill(self, texts: list[str], vectors: list, missing: list[str], embeddings: np.ndarray) -> list:
+        self.cache.put_many(self.model, missing, embeddings)
+        fetched = dict(zip(missing, embeddings))
+        return [fetched[text] if vector is None else vector for text, vector in zip(texts, vectors)]
+    
+    @abstractmethod
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        ...
+    
+    async def _aembed(self, texts: list[str]) -> np.ndarray:
+        return await asyncio.to_thread(self._embed, texts)
+
+
+class APIEmbedder(BaseEmbedder):
+    def __init__(self, settings: Settings = None):
+        super().__init__(settings)
+        self.client = openai_client(self.settings)
+        self.async_client = async_openai_client(self.settings)
+    
+    def _embed(self, texts: list[str]) -> np.ndarray:
         response = self.client.embeddings.create(
             model=self.model,
             input=texts,
@@ -25,3 +90,116 @@ class APIEmbedder:
         
         embeddings = [item.embedding for item in response.data]
         return np.array(embeddings, dtype=np.float32)
+    
+    async def _aembed(self, texts: list[str]) -> np.ndarray:
+        response = await self.async_client.embeddings.create(
+            model=self.model,
+            input=texts,
+            encoding_format="float"
+        )
+        
+        embeddings = [item.embedding for item in response.data]
+        return np.array(embeddings, dtype=np.float32)
+
+
+class HashingEmbedder(BaseEmbedder):
+    use_cache = False
+    NGRAM = 3
+    
+    def __init__(self, settings: Settings = None):
+        super().__init__(settings)
+        self.model = f"hashing-{self.NGRAM}gram"
+        self.dim = self.settings.embedding_dim
+    
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if not features:
+                continue
+            
+            hashes = np.array([zlib.crc32(f.encode("utf-8")) for f in features], dtype=np.uint64)
+            buckets = (hashes % self.dim).astype(np.int64)
+            signs = np.where((hashes >> 31) & 1, -1.0, 1.0).astype(np.float32)
+            np.add.at(vectors[row], buckets, signs)
+        
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return (vectors / np.maximum(norms, 1e-12)).astype(np.float32)
+    
+    def _features(self, text: str) -> list[str]:
+        features = []
+        for token in tokenize(text):
+            features.append(f"w:{token}")
+            padded = f"<{token}>"
+            for i in range(max(1, len(padded) - self.NGRAM + 1)):
+                features.append(f"c:{padded[i:i + self.NGRAM]}")
+        return features
+
+
+class ONNXEmbedder(BaseEmbedder):
+    def __init__(self, settings: Settings = None):
+        super().__init__(settings)
+        
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError("ONNXEmbedder requires onnxruntime and tokenizers to be installed") from e
+        
+        model_dir = Path(self.settings.embedding_onnx_path)
+        self.model = f"onnx:{model_dir.name}"
+        self.session = onnxruntime.InferenceSession(
+            str(model_dir / "model.onnx"),
+            providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_padding()
+        self.tokenizer.enable_truncation(max_length=512)
+        self.input_names = {item.name for item in self.session.get_inputs()}
+        
+        width = self.session.get_outputs()[0].shape[-1]
+        if not isinstance(width, int):
+            width = self._embed(["dimension probe"]).shape[1]
+        if width != self.settings.embedding_dim:
+            raise ValueError(
+                f"ONNX model {model_dir.name} produces {width}-dimensional embeddings, "
+                f"but EMBEDDING_DIM is {self.settings.embedding_dim}"
+            )
+    
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+        
+        hidden = self.session.run(None, inputs)[0]
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+EMBEDDERS = {
+    "api": APIEmbedder,
+    "hashing": HashingEmbedder,
+    "onnx": ONNXEmbedder
+}
+
+
+def register_embedder(name: str, embedder_cls: type):
+    EMBEDDERS[name] = embedder_cls
+
+
+def create_embedder(settings: Settings = None) -> BaseEmbedder:
+    settings = settings or Settings()
+    
+    if settings.embedder not in EMBEDDERS:
+        raise ValueError(f"Unknown embedder: {settings.embedder}. Available: {', '.join(EMBEDDERS)}")
+    
+    return EMBEDDERS[settings.embedder](settings)
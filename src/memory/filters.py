@@ -0,0 +1,107 @@
+import bisect
+import re
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterator
+
+
+EPOCH = re.compile(r"\d+(\.\d+)?")
+
+
+def normalize_timestamp(value) -> str:
+    if value is None or value == "":
+        return datetime.now().isoformat()
+    
+    parsed = value if isinstance(value, datetime) else _parse_timestamp(value)
+    if parsed is None:
+        raise ValueError(f"Invalid timestamp: {value!r}, expected an ISO 8601 string or epoch seconds")
+    
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.isoformat()
+
+
+def _parse_timestamp(value):
+    if isinstance(value, str) and EPOCH.fullmatch(value.strip()):
+        value = float(value)
+    
+    try:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return datetime.fromtimestamp(value)
+        if isinstance(value, str):
+            return datetime.fromisoformat(value.strip())
+    except (ValueError, OverflowError, OSError):
+        pass
+    return None
+
+
+class MetadataIndex:
+    RANGE_KEYS = ("since", "until")
+    
+    def __init__(self):
+        self.fields = defaultdict(lambda: defaultdict(set))
+        self.timeline = []
+    
+    def add(self, chunk: dict):
+        for field, value in chunk["metadata"].items():
+            if self._indexable(value):
+                self.fields[field][value].add(chunk["id"])
+        
+        bisect.insort(self.timeline, (chunk["timestamp"], chunk["id"]))
+    
+    def remove(self, chunk: dict):
+        for field, value in chunk["metadata"].items():
+            if self._indexable(value):
+                ids = self.fields[field].get(value)
+                if ids is not None:
+                    ids.discard(chunk["id"])
+                    if not ids:
+                        del self.fields[field][value]
+        
+        entry = (chunk["timestamp"], chunk["id"])
+        pos = bisect.bisect_left(self.timeline, entry)
+        if pos < len(self.timeline) and self.timeline[pos] == entry:
+            del self.timeline[pos]
+    
+    def oldest(self) -> Iterator[int]:
+        return (chunk_id for _, chunk_id in self.timeline)
+    
+    def newest(self) -> Iterator[int]:
+        return (chunk_id for _, chunk_id in reversed(self.timeline))
+    
+    def select(self, where: dict = None):
+        if not where:
+            return None
+        
+        selected = None
+        
+        for field, value in where.items():
+            if field in self.RANGE_KEYS:
+                continue
+            
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            ids = set()
+            for v in values:
+                ids |= self.fields[field].get(v, set())
+            
+            selected = ids if selected is None else selected & ids
+            if not selected:
+                return set()
+        
+        since = self._timestamp(where.get("since"))
+        until = self._timestamp(where.get("until"))
+        if since is not None or until is not None:
+            start = 0 if since is None else bisect.bisect_left(self.timeline, (since,))
+            end = len(self.timeline) if until is None else bisect.bisect_right(self.timeline, (until, float("inf")))
+            ids = {chunk_id for _, chunk_id in self.timeline[start:end]}
+            selected = ids if selected is None else selected & ids
+        
+        return selected
+    
+    def _indexable(self, value) -> bool:
+        return isinstance(value, (str, int, float, bool)) or value is None
+    
+    def _timestamp(self, value):
+        if value is None or value == "":
+            return None
+        return normalize_timestamp(value)
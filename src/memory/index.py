@@ -0,0 +1,605 @@
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+from src.config import Settings
+
+
+class VectorIndex:
+    STRATEGIES = ("flat", "hnsw", "ivf", "ivfpq")
+    STORAGES = ("float32", "sqfp16", "sq8", "pq")
+    REDUCTIONS = ("none", "truncate", "pca")
+    MAX_TRAIN_SIZE = 100000
+    MAX_TOMBSTONE_RATIO = 0.2
+    PROVISIONAL = "IVF1,Flat"
+    
+    def __init__(self, settings: Settings, index=None, deleted: set = None, checkpointed: int = 0):
+        if settings.memory_index not in self.STRATEGIES:
+            raise ValueError(f"Unknown memory index strategy: {settings.memory_index}")
+        if settings.memory_storage not in self.STORAGES:
+            raise ValueError(f"Unknown memory storage: {settings.memory_storage}")
+        if settings.memory_reduce not in self.REDUCTIONS:
+            raise ValueError(f"Unknown memory reduction: {settings.memory_reduce}")
+        if settings.memory_reduce != "none" and not 0 < settings.memory_reduce_dim < settings.embedding_dim:
+            raise ValueError("MEMORY_REDUCE_DIM must be between 0 and EMBEDDING_DIM")
+        if settings.memory_on_disk and (not settings.memory_dir or settings.memory_index not in ("ivf", "ivfpq")):
+            raise ValueError("MEMORY_ON_DISK requires MEMORY_DIR and MEMORY_INDEX=ivf or ivfpq")
+        
+        self.settings = settings
+        self.strategy = settings.memory_index
+        self.dim = settings.embedding_dim
+        if settings.memory_reduce == "truncate":
+            self.dim = settings.memory_reduce_dim
+        
+        if index is None:
+            index = self._initial_index()
+        
+        self.index = index
+        self.deleted = set(deleted or ())
+        self.checkpointed = checkpointed
+        self.builder = None
+        self.delta = None
+        self.cancelled = False
+        self.errors = []
+        self._configure()
+    
+    @property
+    def ntotal(self) -> int:
+        return self.index.ntotal - len(self.deleted)
+    
+    @property
+    def is_flat(self) -> bool:
+        return isinstance(self._base_index(), faiss.IndexFlat)
+    
+    @property
+    def is_provisional(self) -> bool:
+        base = self._base_index()
+        return (
+            self.settings.memory_on_disk
+            and isinstance(base, faiss.IndexIVFFlat)
+            and base.nlist == 1
+            and not isinstance(self.index, faiss.IndexPreTransform)
+        )
+    
+    @property
+    def needs_upgrade(self) -> bool:
+        if self.is_provisional:
+            return self.factory_string(self.ntotal) != self.PROVISIONAL
+        return self.is_flat and self.factory_string(self.ntotal) != "Flat"
+    
+    @property
+    def rebuild_due(self) -> bool:
+        if self.needs_upgrade and self.ntotal >= self.settings.memory_index_threshold:
+            return True
+        return len(self.deleted) > self.index.ntotal * self.MAX_TOMBSTONE_RATIO
+    
+    @property
+    def building(self) -> bool:
+        return self.builder is not None and self.builder.is_alive()
+    
+    def is_checkpointed(self, idx: int) -> bool:
+        return idx < self.checkpointed
+    
+    def add(self, vectors: np.ndarray, ids: np.ndarray):
+        vectors = self._prepare(vectors)
+        ids = np.asarray(ids, dtype=np.int64)
+        self.index.add_with_ids(vectors, ids)
+        
+        if self.delta is not None:
+            self.delta.append(("add", vectors, ids))
+    
+    def remove(self, ids) -> int:
+        ids = np.fromiter(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return 0
+        
+        if self.delta is not None:
+            self.delta.append(("remove", ids))
+        
+        before = len(self.deleted)
+        self.deleted.update(int(i) for i in ids)
+        return len(self.deleted) - before
+    
+    def search(self, queries: np.ndarray, k: int, ids=None) -> tuple:
+        selector = self._selector(ids)
+        if selector is None:
+            return self.index.search(self._prepare(queries), k)
+        
+        return self.index.search(self._prepare(queries), k, params=self._search_params(selector))
+    
+    def range_search(self, queries: np.ndarray, radius: float, k: int, ids=None) -> list[tuple]:
+        selector = self._selector(ids)
+        params = None if selector is None else self._search_params(selector)
+        
+        try:
+            lims, distances, labels = self.index.range_search(self._prepare(queries), radius, params=params)
+        except RuntimeError:
+            distances, labels = self.search(queries, k, ids)
+            return [(row_d[row_d <= radius], row_l[row_d <= radius]) for row_d, row_l in zip(distances, labels)]
+        
+        rows = []
+        for start, end in zip(lims[:-1], lims[1:]):
+            order = np.argsort(distances[start:end], kind="stable")[:k]
+            rows.append((distances[start:end][order], labels[start:end][order]))
+        return rows
+    
+    def reconstruct(self, ids) -> np.ndarray:
+        ids = np.fromiter(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+        
+        try:
+            ivf = faiss.extract_index_ivf(self.index)
+        except RuntimeError:
+            return self.index.reconstruct_batch(ids)
+        
+        ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+        try:
+            return self.index.reconstruct_batch(ids)
+        finally:
+            ivf.set_direct_map_type(faiss.DirectMap.NoMap)
+    
+    def maybe_upgrade(self) -> bool:
+        if not self.needs_upgrade:
+            return False
+        
+        if self.ntotal < self.settings.memory_index_threshold:
+            return False
+        
+        self.rebuild()
+        return True
+    
+    def rebuild(self):
+        vectors, ids = self._export()
+        index = self._build(vectors)
+        index.add_with_ids(vectors, ids)
+        
+        self.index = index
+        self.deleted = set()
+        self._configure()
+    
+    def start_rebuild(self, lock, on_swap=None) -> bool:
+        if self.building or self.cancelled or not self.rebuild_due:
+            return False
+        
+        self.builder = threading.Thread(target=self._rebuild_in_background, args=(lock, on_swap), daemon=True)
+        self.builder.start()
+        return True
+    
+    def wait(self):
+        if self.builder is not None:
+            self.builder.join()
+    
+    def _rebuild_in_background(self, lock, on_swap):
+        try:
+            while True:
+                with lock.read():
+                    if self.cancelled or not self.rebuild_due:
+                        return
+                    vectors, ids = self._export()
+                    self.delta = []
+                
+                index = self._build(vectors)
+                index.add_with_ids(vectors, ids)
+                
+                with lock.write():
+                    delta, self.delta = self.delta, None
+                    if self.cancelled:
+                        return
+                    
+                    self.index = index
+                    self.deleted = set()
+                    self._configure()
+                    for op in delta:
+                        if op[0] == "add":
+                            self.index.add_with_ids(op[1], op[2])
+                        else:
+                            self.remove(op[1])
+                    
+                    if on_swap is not None:
+                        on_swap()
+        except Exception as e:
+            self.errors.append(str(e))
+            with lock.write():
+                self.delta = None
+    
+    def factory_string(self, n: int) -> str:
+        settings = self.settings
+        
+        prefix = ""
+        if settings.memory_reduce == "pca":
+            prefix = f"PCA{settings.memory_reduce_dim},"
+        
+        encoding = {
+            "float32": "Flat",
+            "sqfp16": "SQfp16",
+            "sq8": "SQ8",
+            "pq": f"PQ{settings.memory_pq_m}"
+        }[settings.memory_storage]
+        
+        if self.strategy == "hnsw":
+            body = f"HNSW{settings.memory_hnsw_m}"
+            if encoding != "Flat":
+                body += f"_{encoding}"
+        elif self.strategy in ("ivf", "ivfpq"):
+            nlist = settings.memory_ivf_nlist or int(4 * math.sqrt(max(n, 1)))
+            nlist = max(1, min(nlist, n // 39))
+            if self.strategy == "ivfpq":
+                encoding = f"PQ{settings.memory_pq_m}"
+            body = f"IVF{nlist},{encoding}"
+        else:
+            body = encoding
+        
+        return prefix + body
+    
+    def _initial_index(self):
+        if self.settings.memory_on_disk:
+            index = faiss.index_factory(self.dim, self.PROVISIONAL)
+            faiss.extract_index_ivf(index).quantizer.add(np.zeros((1, self.dim), dtype=np.float32))
+            index.is_trained = True
+            self._move_lists_to_disk(index)
+            return index
+        
+        if self.strategy == "flat" and self.settings.memory_reduce != "pca":
+            index = faiss.IndexIDMap2(faiss.index_factory(self.dim, self.factory_string(0)))
+            if index.is_trained:
+                return index
+        
+        return faiss.IndexIDMap2(faiss.IndexFlatL2(self.dim))
+    
+    def _build(self, vectors: np.ndarray):
+        factory = self.factory_string(len(vectors))
+        
+        if self.settings.memory_reduce == "pca":
+            reduce_dim = self.settings.memory_reduce_dim
+            inner = faiss.index_factory(reduce_dim, factory.split(",", 1)[1])
+            index = faiss.IndexPreTransform(
+                faiss.PCAMatrix(self.dim, reduce_dim),
+                self._with_ids(inner)
+            )
+        else:
+            index = self._with_ids(faiss.index_factory(self.dim, factory))
+        
+        if not index.is_trained:
+            n = len(vectors)
+            if n > self.MAX_TRAIN_SIZE:
+                sample = np.random.default_rng(0).choice(n, self.MAX_TRAIN_SIZE, replace=False)
+                index.train(vectors[sample])
+            else:
+                index.train(vectors)
+        
+        if self.settings.memory_on_disk:
+            self._move_lists_to_disk(index)
+        
+        return index
+    
+    def _move_lists_to_disk(self, index):
+        ivf = faiss.extract_index_ivf(index)
+        path = Path(self.settings.memory_dir) / f"invlists-{time.time_ns()}.ivfdata"
+        
+        invlists = faiss.OnDiskInvertedLists(ivf.nlist, ivf.code_size, str(path))
+        invlists.this.disown()
+        ivf.replace_invlists(invlists, True)
+    
+    def _with_ids(self, index):
+        if isinstance(index, faiss.IndexIVF):
+            return index
+        return faiss.IndexIDMap2(index)
+    
+    def _export(self) -> tuple:
+        if isinstance(self.index, faiss.IndexPreTransform):
+            id_map = faiss.downcast_index(self.index.index)
+        else:
+            id_map = self.index
+        
+        if isinstance(id_map, faiss.IndexIVF):
+            ids = self._ivf_ids(id_map)
+            vectors = self.reconstruct(ids)
+        elif isinstance(id_map, faiss.IndexIDMap2):
+            ids = faiss.vector_to_array(id_map.id_map).astype(np.int64)
+            if isinstance(self.index, faiss.IndexPreTransform):
+                vectors = self.index.reconstruct_batch(ids)
+            else:
+                vectors = self._base_index().reconstruct_n(0, self.index.ntotal)
+        else:
+            raise RuntimeError("Only ID-mapped or IVF indexes can be exported for rebuilding")
+        
+        if self.deleted:
+            keep = np.array([i not in self.deleted for i in ids], dtype=bool)
+            ids = ids[keep]
+            vectors = vectors[keep]
+        
+        return np.ascontiguousarray(vectors, dtype=np.float32), ids
+    
+    def _ivf_ids(self, ivf) -> np.ndarray:
+        invlists = ivf.invlists
+        ids = []
+        for list_no in range(ivf.nlist):
+            size = invlists.list_size(list_no)
+            if size == 0:
+                continue
+            
+            ptr = invlists.get_ids(list_no)
+            ids.append(faiss.rev_swig_ptr(ptr, size).copy())
+            invlists.release_ids(list_no, ptr)
+        
+        if not ids:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(ids).astype(np.int64)
+    
+    def _prepare(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        
+        if self.settings.memory_reduce == "truncate" and vectors.shape[1] > self.dim:
+            vectors = np.ascontiguousarray(vectors[:, :self.dim])
+            faiss.normalize_L2(vectors)
+        
+        return vectors
+    
+    def _base_index(self):
+        index = self.index
+        while isinstance(index, (faiss.IndexPreTransform, faiss.IndexIDMap, faiss.IndexIDMap2)):
+            index = faiss.downcast_index(index.index)
+        return index
+    
+    def _selector(self, ids=None):
+        if ids is not None:
+            return faiss.IDSelectorBatch(np.fromiter(ids, dtype=np.int64, count=len(ids)))
+        
+        if self.deleted:
+            excluded = faiss.IDSelectorBatch(np.fromiter(self.deleted, dtype=np.int64, count=len(self.deleted)))
+            return faiss.IDSelectorNot(excluded)
+        
+        return None
+    
+    def _search_params(self, selector):
+        base = self._base_index()
+        
+        if isinstance(base, faiss.IndexHNSW):
+            params = faiss.SearchParametersHNSW(sel=selector, efSearch=self.settings.memory_ef_search)
+        elif isinstance(base, faiss.IndexIVF):
+            params = faiss.SearchParametersIVF(sel=selector, nprobe=self.settings.memory_nprobe)
+        else:
+            params = faiss.SearchParameters(sel=selector)
+        
+        if isinstance(self.index, faiss.IndexPreTransform):
+            params = faiss.SearchParametersPreTransform(index_params=params)
+        
+        return params
+    
+    def _configure(self):
+        base = self._base_index()
+        
+        if isinstance(base, faiss.IndexHNSW):
+            base.hnsw.efSearch = self.settings.memory_ef_search
+        elif isinstance(base, faiss.IndexIVF):
+            base.nprobe = self.settings.memory_nprobe
+
+
+class ShardedIndex:
+    def __init__(self, settings: Settings, indexes: list = None, deleted: set = None, checkpointed=0):
+        self.settings = settings
+        count = max(1, settings.memory_shards)
+        indexes = indexes or [None] * count
+        if not isinstance(checkpointed, list):
+            checkpointed = [checkpointed] * len(indexes)
+        
+        shard_settings = self._shard_settings(len(indexes))
+        self.shards = [VectorIndex(shard_settings, index, checkpointed=upto) for index, upto in zip(indexes, checkpointed)]
+        self.pool = ThreadPoolExecutor(max_workers=len(self.shards), thread_name_prefix="memory-shard")
+        self.deleted = deleted or set()
+        
+        if len(self.shards) != count:
+            self.reshard(count)
+    
+    @property
+    def index(self) -> list:
+        return [shard.index for shard in self.shards]
+    
+    @property
+    def ntotal(self) -> int:
+        return sum(shard.ntotal for shard in self.shards)
+    
+    @property
+    def deleted(self) -> set:
+        return set().union(*(shard.deleted for shard in self.shards))
+    
+    @deleted.setter
+    def deleted(self, ids: set):
+        groups = self._group(ids)
+        for shard_no, shard in enumerate(self.shards):
+            shard.deleted = set(groups.get(shard_no, ()))
+    
+    def add(self, vectors: np.ndarray, ids: np.ndarray):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        ids = np.asarray(ids, dtype=np.int64)
+        
+        shard_nos = ids % len(self.shards)
+        jobs = [
+            (shard, vectors[shard_nos == shard_no], ids[shard_nos == shard_no])
+            for shard_no, shard in enumerate(self.shards)
+            if np.any(shard_nos == shard_no)
+        ]
+        list(self.pool.map(lambda job: job[0].add(job[1], job[2]), jobs))
+        
+        capacity = self.settings.memory_shard_capacity
+        if capacity <= 0:
+            return
+        
+        count = len(self.shards)
+        while self.ntotal > capacity * count:
+            count *= 2
+        
+        if count != len(self.shards):
+            self.reshard(count)
+    
+    def is_checkpointed(self, idx: int) -> bool:
+        return self.shards[idx % len(self.shards)].is_checkpointed(idx)
+    
+    def remove(self, ids) -> int:
+        groups = self._group(ids)
+        return sum(self.shards[shard_no].remove(group) for shard_no, group in groups.items())
+    
+    def search(self, queries: np.ndarray, k: int, ids=None) -> tuple:
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+        
+        if ids is None:
+            jobs = [(shard, None) for shard in self.shards]
+        else:
+            jobs = [(self.shards[shard_no], group) for shard_no, group in self._group(ids).items()]
+        
+        if not jobs:
+            return np.full((len(queries), k), np.inf, dtype=np.float32), np.full((len(queries), k), -1, dtype=np.int64)
+        
+        results = list(self.pool.map(lambda job: job[0].search(queries, k, job[1]), jobs))
+        return self._merge(results, k)
+    
+    def range_search(self, queries: np.ndarray, radius: float, k: int, ids=None) -> list[tuple]:
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+        
+        if ids is None:
+            jobs = [(shard, None) for shard in self.shards]
+        else:
+            jobs = [(self.shards[shard_no], group) for shard_no, group in self._group(ids).items()]
+        
+        results = list(self.pool.map(lambda job: job[0].range_search(queries, radius, k, job[1]), jobs))
+        
+        rows = []
+        for i in range(len(queries)):
+            distances = np.concatenate([result[i][0] for result in results] or [np.empty(0, dtype=np.float32)])
+            labels = np.concatenate([result[i][1] for result in results] or [np.empty(0, dtype=np.int64)])
+            order = np.argsort(distances, kind="stable")[:k]
+            rows.append((distances[order], labels[order]))
+        return rows
+    
+    def reconstruct(self, ids) -> np.ndarray:
+        ids = [int(idx) for idx in ids]
+        groups = self._group(ids)
+        
+        vectors = {}
+        for shard_no, group in groups.items():
+            vectors.update(zip(group, self.shards[shard_no].reconstruct(group)))
+        
+        if not ids:
+            return np.empty((0, self.shards[0].dim), dtype=np.float32)
+        return np.stack([vectors[idx] for idx in ids])
+    
+    @property
+    def rebuild_due(self) -> bool:
+        return any(shard.rebuild_due for shard in self.shards)
+    
+    def maybe_upgrade(self) -> bool:
+        return any([shard.maybe_upgrade() for shard in self.shards])
+    
+    def start_rebuild(self, lock, on_swap=None) -> bool:
+        return any([shard.start_rebuild(lock, on_swap) for shard in self.shards])
+    
+    def wait(self):
+        for shard in self.shards:
+            shard.wait()
+    
+    def rebuild(self):
+        list(self.pool.map(lambda shard: shard.rebuild(), self.shards))
+    
+    def reshard(self, count: int):
+        exported = [shard._export() for shard in self.shards if shard.index.ntotal > 0]
+        checkpointed = min(shard.checkpointed for shard in self.shards)
+        for shard in self.shards:
+            shard.cancelled = True
+        
+        shard_settings = self._shard_settings(count)
+        self.shards = [VectorIndex(shard_settings, checkpointed=checkpointed) for _ in range(count)]
+        self.pool.shutdown()
+        self.pool = ThreadPoolExecutor(max_workers=count, thread_name_prefix="memory-shard")
+        
+        if exported:
+            vectors = np.concatenate([vectors for vectors, ids in exported])
+            ids = np.concatenate([ids for vectors, ids in exported])
+            shard_nos = ids % count
+            for shard_no, shard in enumerate(self.shards):
+                if np.any(shard_nos == shard_no):
+                    shard.add(vectors[shard_nos == shard_no], ids[shard_nos == shard_no])
+    
+    def _shard_settings(self, count: int) -> Settings:
+        threshold = math.ceil(self.settings.memory_index_threshold / count)
+        return replace(self.settings, memory_index_threshold=threshold)
+    
+    def _group(self, ids) -> dict:
+        groups = {}
+        for idx in ids:
+            groups.setdefault(int(idx) % len(self.shards), []).append(int(idx))
+        return groups
+    
+    def _merge(self, results: list[tuple], k: int) -> tuple:
+        distances = np.hstack([distances for distances, labels in results])
+        labels = np.hstack([labels for distances, labels in results])
+        distances = np.where(labels < 0, np.inf, distances).astype(np.float32)
+        
+        order = np.argsort(distances, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(distances, order, axis=1), np.take_along_axis(labels, order, axis=1)
+
+
+def create_index(settings: Settings, index=None, deleted: set = None, checkpointed=0):
+    if settings.memory_shards > 1 or isinstance(index, list):
+        indexes = index if isinstance(index, list) or index is None else [index]
+        return ShardedIndex(settings, indexes, deleted, checkpointed)
+    return VectorIndex(settings, index, deleted, checkpointed)
+
+
+def recall_report(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    settings: Settings = None,
+    k: int = 10,
+    storages: tuple = ("float32", "sqfp16", "sq8", "pq"),
+    reductions: tuple = (("none", 0),)
+) -> list[dict]:
+    settings = settings or Settings()
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+    ids = np.arange(len(vectors), dtype=np.int64)
+    
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+    baseline_bytes = vectors.shape[1] * 4
+    
+    report = []
+    for reduce, reduce_dim in reductions:
+        for storage in storages:
+            config = replace(
+                settings,
+                embedding_dim=vectors.shape[1],
+                memory_storage=storage,
+                memory_reduce=reduce,
+                memory_reduce_dim=reduce_dim,
+                memory_index_threshold=0
+            )
+            index = VectorIndex(config)
+            index.add(vectors, ids)
+            index.maybe_upgrade()
+            _, found = index.search(queries, k)
+            
+            recall = np.mean([
+                len(set(row_found) & set(row_truth)) / k
+                for row_found, row_truth in zip(found, truth)
+            ])
+            bytes_per_vector = len(faiss.serialize_index(index.index)) / len(vectors)
+            
+            report.append({
+                "index": index.factory_string(len(vectors)),
+                "storage": storage,
+                "reduce": reduce,
+                "dim": reduce_dim or vectors.shape[1],
+                "bytes_per_vector": round(bytes_per_vector, 1),
+                "compression": round(baseline_bytes / bytes_per_vector, 2),
+                f"recall@{k}": round(float(recall), 4)
+            })
+    
+    return report
@@ -0,0 +1,217 @@
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from src.memory.filters import normalize_timestamp
+from src.memory.memory_agent import MemoryAgent
+from src.utils import AgentLogger
+
+
+FORMATS = ("jsonl", "csv")
+
+
+def detect_format(path: str) -> str:
+    suffix = Path(path).suffix.lower().lstrip(".")
+    if suffix in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    if suffix in ("csv", "tsv"):
+        return "csv"
+    raise ValueError(f"Cannot detect format of {path}, pass one of {FORMATS}")
+
+
+def read_records(path: str, fmt: str = None) -> Iterator[dict]:
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}. Available: {FORMATS}")
+    
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            delimiter = "\t" if path.endswith(".tsv") else ","
+            yield from csv.DictReader(f, delimiter=delimiter)
+            return
+        
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def text_fields_of(record: dict, text_fields: list[str] = None, timestamp_field: str = "timestamp") -> list[str]:
+    if text_fields is None:
+        text_fields = ["text"] if "text" in record else [
+            field for field, value in record.items() if isinstance(value, str) and field != timestamp_field
+        ]
+    return [field for field in text_fields if record.get(field)]
+
+
+def record_text(record: dict, fields: list[str]) -> str:
+    if len(fields) == 1:
+        return str(record[fields[0]])
+    return "\n".join(f"{field.capitalize()}: {record[field]}" for field in fields)
+
+
+def record_metadata(
+    record: dict,
+    fields: list[str],
+    metadata_fields: list[str] = None,
+    timestamp_field: str = "timestamp"
+) -> dict:
+    if metadata_fields is not None:
+        return {field: record[field] for field in metadata_fields if field in record and field != timestamp_field}
+    
+    return {
+        field: value for field, value in record.items()
+        if field not in fields and field != timestamp_field
+        and isinstance(value, (str, int, float, bool)) and len(str(value)) <= 200
+    }
+
+
+class Ingestor:
+    def __init__(
+        self,
+        memory: MemoryAgent,
+        text_fields: list[str] = None,
+        metadata_fields: list[str] = None,
+        timestamp_field: str = "timestamp",
+        batch_size: int = None,
+        workers: int = None,
+        logger: AgentLogger = None,
+        report_every: float = 5.0
+    ):
+        settings = memory.settings
+        self.memory = memory
+        self.text_fields = text_fields or None
+        self.metadata_fields = metadata_fields
+        self.timestamp_field = timestamp_field
+        self.batch_size = batch_size or settings.ingest_batch_size
+        self.workers = workers or settings.ingest_workers
+        self.max_in_flight = self.workers * 2
+        self.logger = logger or AgentLogger()
+        self.report_every = report_every
+        self.source = None
+        self.stats = {"records": 0, "chunks": 0, "skipped": 0, "seconds": 0.0}
+    
+    def run(self, records: Iterable[dict], source: str = None) -> dict:
+        self.source = source
+        start = time.perf_counter()
+        last_report = start
+        pending = deque()
+        
+        with self.memory.bulk(), ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for batch in self._batches(records):
+                pending.append(self._submit(pool, batch))
+                
+                while len(pending) >= self.max_in_flight:
+                    self._commit(*pending.popleft())
+                
+                if time.perf_counter() - last_report >= self.report_every:
+                    last_report = time.perf_counter()
+                    self._report(last_report - start)
+            
+            while pending:
+                self._commit(*pending.popleft())
+        
+        self.stats["seconds"] += time.perf_counter() - start
+        self._report(self.stats["seconds"], final=True)
+        return dict(self.stats)
+    
+    def _batches(self, records: Iterable[dict]) -> Iterator[list[dict]]:
+        records = iter(records)
+        while batch := list(islice(records, self.batch_size)):
+            yield batch
+    
+    def _submit(self, pool: ThreadPoolExecutor, batch: list[dict]) -> tuple:
+        texts, metadatas, timestamps = [], [], []
+        for record in batch:
+            fields = text_fields_of(record, self.text_fields, self.timestamp_field)
+            text = record_text(record, fields)
+            if not text.strip():
+                self.stats["skipped"] += 1
+                continue
+            
+            try:
+                timestamp = normalize_timestamp(record.get(self.timestamp_field))
+            except ValueError:
+                self.stats["skipped"] += 1
+                continue
+            
+            metadata = record_metadata(record, fields, self.metadata_fields, self.timestamp_field)
+            if self.source:
+                metadata.setdefault("source", self.source)
+            
+            texts.append(text)
+            metadatas.append(metadata)
+            timestamps.append(timestamp)
+        
+        entries, pieces = self.memory.prepare(texts, metadatas, timestamps)
+        if not pieces:
+            return entries, pieces, None
+        
+        future = pool.submit(self.memory.embedder.encode, [piece["text"] for piece, parent in pieces])
+        return entries, pieces, future
+    
+    def _commit(self, entries: list[dict], pieces: list[tuple], future):
+        if future is not None:
+            self.memory.add_embedded(entries, pieces, future.result())
+        self.stats["records"] += len(entries)
+        self.stats["chunks"] += len(pieces)
+    
+    def _report(self, elapsed: float, final: bool = False):
+        rate = self.stats["records"] / elapsed if elapsed else 0.0
+        prefix = "Ingested" if final else "Ingesting"
+        self.logger.progress(
+            f"{prefix} {self.stats['records']} records ({self.stats['chunks']} chunks, "
+            f"{self.stats['skipped']} skipped) in {elapsed:.1f}s, {rate:.0f} records/s"
+        )
+
+
+def ingest_files(paths: list[str], memory: MemoryAgent = None, fmt: str = None, **kwargs) -> dict:
+    memory = memory or MemoryAgent()
+    ingestor = Ingestor(memory, **kwargs)
+    
+    stats = {}
+    for path in paths:
+        stats = ingestor.run(read_records(path, fmt), source=Path(path).name)
+    
+    return stats
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Bulk import JSONL/CSV records into memory")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--format", choices=FORMATS)
+    parser.add_argument("--text-field", action="append", dest="text_fields")
+    parser.add_argument("--metadata-field", action="append", dest="metadata_fields")
+    parser.add_argument("--timestamp-field", default="timestamp")
+    parser.add_argument("--batch-size", type=int)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+    
+    memory = MemoryAgent()
+    try:
+        stats = ingest_files(
+            args.paths,
+            memory=memory,
+            fmt=args.format,
+            text_fields=args.text_fields,
+            metadata_fields=args.metadata_fields,
+            timestamp_field=args.timestamp_field,
+            batch_size=args.batch_size,
+            workers=args.workers
+        )
+    finally:
+        memory.close()
+    
+    print(json.dumps(stats, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
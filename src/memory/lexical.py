@@ -0,0 +1,71 @@
+import math
+import re
+from collections import Counter, defaultdict
+
+
+def tokenize(text: str) -> list[str]:
+    text = text.lower()
+    words = re.findall(r"\w+", text)
+    identifiers = re.findall(r"\w+(?:[.\-/:]\w+)+", text)
+    return words + identifiers
+
+
+class BM25Index:
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(dict)
+        self.doc_terms = {}
+        self.doc_len = {}
+        self.total_len = 0
+    
+    def __len__(self) -> int:
+        return len(self.doc_terms)
+    
+    def add(self, doc_id: int, text: str):
+        if doc_id in self.doc_terms:
+            self.remove(doc_id)
+        
+        terms = Counter(tokenize(text))
+        for term, tf in terms.items():
+            self.postings[term][doc_id] = tf
+        
+        self.doc_terms[doc_id] = terms
+        self.doc_len[doc_id] = sum(terms.values())
+        self.total_len += self.doc_len[doc_id]
+    
+    def remove(self, doc_id: int):
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        
+        for term in terms:
+            docs = self.postings[term]
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.postings[term]
+        
+        self.total_len -= self.doc_len.pop(doc_id)
+    
+    def search(self, query: str, k: int = 3, ids: set = None) -> list[tuple]:
+        n = len(self.doc_terms)
+        if n == 0:
+            return []
+        
+        avg_len = self.total_len / n
+        scores = defaultdict(float)
+        
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, tf in docs.items():
+                if ids is not None and doc_id not in ids:
+                    continue
+                
+                norm = tf + self.k1 * (1 - self.b + self.b * self.doc_len[doc_id] / avg_len)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / norm
+        
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
@@ -1,54 +1,730 @@
+import asyncio
+import atexit
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+
 import faiss
 import numpy as np
-from datetime import datetime
 
-from src.memory.embedder import APIEmbedder
+from src.memory.chunking import chunk_text
+from src.memory.compaction import MemoryCompactor
+from src.memory.disk_store import SqliteChunkStore
+from src.memory.embedder import BaseEmbedder, create_embedder
+from src.memory.filters import MetadataIndex, normalize_timestamp
+from src.memory.index import create_index
+from src.memory.lexical import BM25Index
+from src.memory.locks import RWLock
+from src.memory.persistence import MemoryPersistence
 from src.config import Settings
+from src.utils import AgentLogger
 
 
 class MemoryAgent:
-    def __init__(self):
-        settings = Settings()
-        self.embedder = APIEmbedder()
-        self.index = faiss.IndexFlatL2(settings.embedding_dim)
+    SEARCH_MODES = ("vector", "lexical", "hybrid")
+    
+    def __init__(self, settings: Settings = None, embedder: BaseEmbedder = None):
+        settings = settings or Settings()
+        self.settings = settings
+        self.embedder = embedder or create_embedder(settings)
+        self.index = None if settings.memory_dir else create_index(settings)
         self.store = {}
+        if settings.memory_on_disk:
+            self.store = SqliteChunkStore(str(Path(settings.memory_dir) / "chunks.sqlite"))
+        self.parents = {}
+        self.metadata_index = MetadataIndex()
+        self.lexical_index = BM25Index()
+        self.indexed = not settings.memory_on_disk
         self.counter = 0
+        self.persistence = None
+        self.lock = RWLock()
+        self.queue = None
+        self.worker = None
+        self.compactor = None
+        self.errors = []
+        self.logger = AgentLogger()
+        
+        if settings.memory_dir:
+            self.persistence = MemoryPersistence(settings.memory_dir, settings.memory_snapshot_every)
+            self._restore()
+            self.index.start_rebuild(self.lock, self._rebuilt)
+        
+        if settings.memory_write_behind:
+            self.queue = queue.Queue()
+            self.worker = threading.Thread(target=self._write_behind_loop, daemon=True)
+            self.worker.start()
+            atexit.register(self.flush)
+        
+        if settings.memory_compact_interval > 0:
+            self.compactor = MemoryCompactor(self)
+            self.compactor.start()
     
     def add(self, text: str, metadata: dict = None) -> str:
-        timestamp = datetime.now().isoformat()
+        entry = self._new_chunk(text, metadata)
+        
+        if self.queue is not None:
+            self.queue.put(entry)
+            return "Queued for saving to memory"
+        
+        ids = self._write([entry])
+        
+        return f"Saved to memory with ID: {ids[0]}"
+    
+    async def aadd(self, text: str, metadata: dict = None) -> str:
+        entry = self._new_chunk(text, metadata)
+        
+        if self.queue is not None:
+            self.queue.put(entry)
+            return "Queued for saving to memory"
+        
+        pieces = self._split([entry])
+        embs = await self.embedder.aencode([piece["text"] for piece, parent in pieces])
+        ids = await asyncio.to_thread(self._insert, [entry], pieces, embs)
+        
+        return f"Saved to memory with ID: {ids[0]}"
+    
+    def add_many(self, texts: list[str], metadatas: list[dict] = None) -> list[int]:
+        if not texts:
+            return []
+        
+        metadatas = metadatas or [None] * len(texts)
+        entries = [self._new_chunk(text, metadata) for text, metadata in zip(texts, metadatas)]
+        
+        if self.queue is not None:
+            for entry in entries:
+                self.queue.put(entry)
+            return []
+        
+        return self._write(entries)
+    
+    def prepare(self, texts: list[str], metadatas: list[dict] = None, timestamps: list[str] = None) -> tuple[list[dict], list[tuple]]:
+        metadatas = metadatas or [None] * len(texts)
+        timestamps = timestamps or [None] * len(texts)
+        
+        entries = []
+        for text, metadata, timestamp in zip(texts, metadatas, timestamps):
+            entry = self._new_chunk(text, metadata)
+            if timestamp is not None:
+                entry["timestamp"] = normalize_timestamp(timestamp)
+            entries.append(entry)
+        
+        return entries, self._split(entries)
+    
+    def add_embedded(self, entries: list[dict], pieces: list[tuple], embs: np.ndarray) -> list[int]:
+        if not pieces:
+            return []
+        return self._insert(entries, pieces, embs)
+    
+    @contextmanager
+    def bulk(self):
+        snapshot_every = self.persistence.snapshot_every if self.persistence else 0
+        if self.persistence:
+            self.persistence.snapshot_every = 0
+        
+        try:
+            yield self
+        finally:
+            if self.persistence:
+                self.persistence.snapshot_every = snapshot_every
+                self.snapshot()
+    
+    def remove(self, ids: list[int]) -> int:
+        with self.lock.write():
+            removed = self._remove(ids)
+            self.index.start_rebuild(self.lock, self._rebuilt)
+            
+            if self.persistence and removed:
+                self.persistence.log_remove(removed)
+        
+        return len(removed)
+    
+    def evict(self) -> int:
+        with self.lock.write():
+            evicted = self._evict()
+            self.index.start_rebuild(self.lock, self._rebuilt)
+            
+            if self.persistence and evicted:
+                self.persistence.log_remove(evicted)
         
-        chunk = {
-            "id": self.counter,
+        return len(evicted)
+    
+    def flush(self):
+        if self.queue is not None:
+            self.queue.join()
+        
+        if self.errors:
+            errors, self.errors = self.errors, []
+            lost = sum(len(error["chunks"]) for error in errors)
+            raise RuntimeError(f"{lost} queued memories were not saved: {errors[-1]['error']}")
+    
+    def search(
+        self,
+        query: str,
+        k: int = 3,
+        where: dict = None,
+        mode: str = None,
+        max_distance: float = None,
+        adaptive: bool = None
+    ) -> list[dict]:
+        return self.search_many([query], k, where, mode, max_distance, adaptive)[0]
+    
+    def search_many(
+        self,
+        queries: list[str],
+        k: int = 3,
+        where: dict = None,
+        mode: str = None,
+        max_distance: float = None,
+        adaptive: bool = None
+    ) -> list[list[dict]]:
+        mode = self._search_mode(mode)
+        
+        q_embs = None
+        if queries and mode != "lexical" and self.index.ntotal > 0:
+            q_embs = self.embedder.encode(queries)
+        
+        return self._search_many(queries, k, where, mode, max_distance, adaptive, q_embs)
+    
+    async def asearch(
+        self,
+        query: str,
+        k: int = 3,
+        where: dict = None,
+        mode: str = None,
+        max_distance: float = None,
+        adaptive: bool = None
+    ) -> list[dict]:
+        return (await self.asearch_many([query], k, where, mode, max_distance, adaptive))[0]
+    
+    async def asearch_many(
+        self,
+        queries: list[str],
+        k: int = 3,
+        where: dict = None,
+        mode: str = None,
+        max_distance: float = None,
+        adaptive: bool = None
+    ) -> list[list[dict]]:
+        mode = self._search_mode(mode)
+        
+        q_embs = None
+        if queries and mode != "lexical" and self.index.ntotal > 0:
+            q_embs = await self.embedder.aencode(queries)
+        
+        return await asyncio.to_thread(self._search_many, queries, k, where, mode, max_distance, adaptive, q_embs)
+    
+    def get_parent(self, parent_id: int) -> dict:
+        self.ensure_indexes()
+        with self.lock.read():
+            return self.parents.get(parent_id)
+    
+    def get_all(self) -> list[dict]:
+        with self.lock.read():
+            return list(self.store.values())
+    
+    def get_recent(self, n: int = 5) -> list[dict]:
+        self.ensure_indexes()
+        with self.lock.read():
+            return [self.store[idx] for idx in islice(self.metadata_index.newest(), n)]
+    
+    def ensure_indexes(self):
+        if not self.indexed:
+            with self.lock.write():
+                self._build_indexes()
+    
+    def snapshot(self):
+        if self.persistence:
+            with self.lock.write():
+                written = self._snapshot()
+            written.result()
+    
+    def close(self):
+        if self.compactor is not None:
+            self.compactor.stop()
+        if self.worker is not None:
+            self.queue.put(None)
+            self.worker.join()
+            self.worker = None
+            atexit.unregister(self.flush)
+        self.index.wait()
+        if self.persistence:
+            self.snapshot()
+            self.persistence.close()
+        if isinstance(self.store, SqliteChunkStore):
+            self.store.close()
+    
+    def _search_many(
+        self,
+        queries: list[str],
+        k: int,
+        where: dict,
+        mode: str,
+        max_distance: float,
+        adaptive: bool,
+        q_embs: np.ndarray = None
+    ) -> list[list[dict]]:
+        max_distance = self.settings.memory_max_distance if max_distance is None else max_distance
+        adaptive = self.settings.memory_adaptive_k if adaptive is None else adaptive
+        
+        if not queries:
+            return []
+        
+        if where or mode != "vector":
+            self.ensure_indexes()
+        
+        with self.lock.read():
+            ids = self.metadata_index.select(where)
+            limit = self.index.ntotal if ids is None else len(ids)
+            
+            if limit == 0:
+                return [[] for _ in queries]
+            
+            fetch = k
+            if mode == "hybrid" or self.parents:
+                fetch = k * 3
+            
+            if mode == "lexical":
+                ranked = [self._lexical_search(query, fetch, ids) for query in queries]
+            else:
+                if q_embs is None:
+                    q_embs = self.embedder.encode(queries)
+                ranked = self._vector_search(q_embs, min(fetch, limit), ids, max_distance)
+            
+            if mode == "hybrid":
+                ranked = [
+                    self._fuse(vector_hits, self._lexical_search(query, fetch, ids), vector_only=bool(max_distance))
+                    for query, vector_hits in zip(queries, ranked)
+                ]
+            
+            results = [self._collapse(row, k) for row in ranked]
+        
+        if adaptive:
+            results = [self._cut_at_gap(row) for row in results]
+        
+        return results
+    
+    def _search_mode(self, mode: str = None) -> str:
+        mode = mode or self.settings.memory_search_mode
+        if mode not in self.SEARCH_MODES:
+            raise ValueError(f"Unknown memory search mode: {mode}")
+        return mode
+    
+    def _vector_search(self, q_embs: np.ndarray, k: int, ids: set = None, max_distance: float = 0.0) -> list[list[tuple]]:
+        if max_distance:
+            rows = self.index.range_search(q_embs, max_distance, k, ids)
+        else:
+            rows = zip(*self.index.search(q_embs, k, ids))
+        
+        hits = []
+        for distances, indices in rows:
+            row = {}
+            for distance, idx in zip(distances, indices):
+                idx = int(idx)
+                if idx in self.store and idx not in row:
+                    row[idx] = float(distance)
+            hits.append([(idx, 1.0 - distance / 2, distance) for idx, distance in row.items()])
+        
+        return hits
+    
+    def _lexical_search(self, query: str, k: int, ids: set = None) -> list[tuple]:
+        return [(doc_id, score, None) for doc_id, score in self.lexical_index.search(query, k, ids)]
+    
+    def _fuse(self, vector_hits: list[tuple], lexical_hits: list[tuple], vector_only: bool = False) -> list[tuple]:
+        distances = {idx: distance for idx, score, distance in vector_hits}
+        scores = {}
+        for ranking in (vector_hits, lexical_hits):
+            for rank, (idx, score, distance) in enumerate(ranking):
+                if vector_only and idx not in distances:
+                    continue
+                scores[idx] = scores.get(idx, 0.0) + 1.0 / (self.settings.memory_rrf_k + rank + 1)
+        
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        return [(idx, scores[idx], distances.get(idx)) for idx in ranked]
+    
+    def _cut_at_gap(self, results: list[dict]) -> list[dict]:
+        if len(results) < 2:
+            return results
+        
+        gap = self.settings.memory_score_gap * abs(results[0]["score"])
+        for i in range(1, len(results)):
+            if results[i - 1]["score"] - results[i]["score"] > gap:
+                return results[:i]
+        
+        return results
+    
+    def _collapse(self, ranked: list[tuple], k: int) -> list[dict]:
+        results = []
+        seen_parents = set()
+        
+        for idx, score, distance in ranked:
+            chunk = self.store[idx]
+            parent_id = chunk.get("parent_id")
+            if parent_id is not None:
+                if parent_id in seen_parents:
+                    continue
+                seen_parents.add(parent_id)
+            
+            results.append({**chunk, "score": score, "distance": distance})
+            if len(results) == k:
+                break
+        
+        return results
+    
+    def _new_chunk(self, text: str, metadata: dict = None) -> dict:
+        return {
+            "id": None,
             "text": text,
-            "timestamp": timestamp,
+            "timestamp": datetime.now().isoformat(),
             "metadata": metadata or {}
         }
+    
+    def _split(self, entries: list[dict]) -> list[tuple]:
+        pieces = []
+        
+        for entry in entries:
+            parts = chunk_text(
+                entry["text"],
+                self.settings.memory_chunking,
+                self.settings.memory_chunk_tokens,
+                self.settings.memory_chunk_overlap
+            )
+            
+            if len(parts) == 1:
+                pieces.append((entry, None))
+                continue
+            
+            entry["children"] = []
+            for part in parts:
+                metadata = dict(entry["metadata"])
+                if part["field"]:
+                    metadata["field"] = part["field"]
+                
+                piece = self._new_chunk(part["text"], metadata)
+                piece["timestamp"] = entry["timestamp"]
+                pieces.append((piece, entry))
+        
+        return pieces
+    
+    def _write(self, entries: list[dict]) -> list[int]:
+        pieces = self._split(entries)
+        embs = self.embedder.encode([piece["text"] for piece, parent in pieces])
+        return self._insert(entries, pieces, embs)
+    
+    def _insert(self, entries: list[dict], pieces: list[tuple], embs: np.ndarray) -> list[int]:
+        with self.lock.write():
+            parents = [entry for entry in entries if "children" in entry]
+            for parent in parents:
+                parent["id"] = self.counter
+                self.counter += 1
+            
+            skip = [parent is not None for piece, parent in pieces]
+            duplicates = self._find_duplicates(embs, skip)
+            earlier = self._find_batch_duplicates(embs, skip, duplicates)
+            
+            new_chunks = []
+            new_embs = []
+            updated = []
+            for i, ((piece, parent), emb) in enumerate(zip(pieces, embs)):
+                if earlier[i] is not None:
+                    first = pieces[earlier[i]][0]
+                    duplicates[i] = duplicates[earlier[i]]
+                    if duplicates[i] is None:
+                        piece["id"] = first["id"]
+                        self._absorb(first, piece)
+                        continue
+                
+                duplicate = duplicates[i]
+                if duplicate is not None:
+                    piece["id"] = duplicate
+                    updated.append(self._merge(duplicate, piece))
+                    continue
+                
+                piece["id"] = self.counter
+                self.counter += 1
+                if parent is not None:
+                    piece["parent_id"] = parent["id"]
+                new_chunks.append(piece)
+                new_embs.append(emb)
+            
+            if self.persistence:
+                if parents:
+                    self.persistence.log_parents(parents)
+                if new_chunks:
+                    self.persistence.log_add(new_chunks, new_embs)
+                if updated:
+                    self.persistence.log_update(updated)
+            
+            for parent in parents:
+                self.parents[parent["id"]] = parent
+            
+            if new_chunks:
+                self.index.add(np.stack(new_embs), np.array([chunk["id"] for chunk in new_chunks], dtype=np.int64))
+                self.store.update((chunk["id"], chunk) for chunk in new_chunks)
+                for chunk in new_chunks:
+                    self._index_chunk(chunk)
+            
+            evicted = self._evict()
+            if self.persistence and evicted:
+                self.persistence.log_remove(evicted)
+            
+            self.index.start_rebuild(self.lock, self._rebuilt)
+            
+            if self.persistence and self.settings.memory_on_disk:
+                self.persistence.checkpoint(self.index.index, self.counter)
+            if self.persistence and self.persistence.should_snapshot() and not self.persistence.busy:
+                self._snapshot()
+        
+        return [entry["id"] for entry in entries]
+    
+    def _find_duplicates(self, embs: np.ndarray, skip: list[bool]) -> list:
+        if not self.settings.memory_dedup or self.index.ntotal == 0:
+            return [None] * len(embs)
+        
+        distances, indices = self.index.search(embs, 1)
+        
+        duplicates = []
+        for distance, idx, skipped in zip(distances[:, 0], indices[:, 0], skip):
+            is_duplicate = (
+                not skipped
+                and idx in self.store
+                and self.store[idx].get("parent_id") is None
+                and distance <= self.settings.memory_dedup_distance
+            )
+            duplicates.append(int(idx) if is_duplicate else None)
+        
+        return duplicates
+    
+    def _find_batch_duplicates(self, embs: np.ndarray, skip: list[bool], duplicates: list) -> list:
+        earlier = [None] * len(embs)
+        if not self.settings.memory_dedup:
+            return earlier
+        
+        seen = faiss.IndexFlatL2(embs.shape[1])
+        positions = []
+        for i, (emb, skipped) in enumerate(zip(embs, skip)):
+            if skipped:
+                continue
+            
+            query = np.ascontiguousarray(emb.reshape(1, -1), dtype=np.float32)
+            if seen.ntotal:
+                distances, indices = seen.search(query, 1)
+                if distances[0, 0] <= self.settings.memory_dedup_distance:
+                    earlier[i] = positions[indices[0, 0]]
+                    continue
+            
+            seen.add(query)
+            positions.append(i)
+        
+        return earlier
+    
+    def _absorb(self, chunk: dict, duplicate: dict):
+        metadata = {**chunk["metadata"], **duplicate["metadata"]}
+        metadata["hits"] = chunk["metadata"].get("hits", 1) + 1
+        chunk["text"] = duplicate["text"]
+        chunk["timestamp"] = duplicate["timestamp"]
+        chunk["metadata"] = metadata
+    
+    def _merge(self, idx: int, chunk: dict) -> dict:
+        existing = self.store[idx]
+        metadata = {**existing["metadata"], **chunk["metadata"]}
+        metadata["hits"] = existing["metadata"].get("hits", 1) + 1
+        
+        merged = {
+            "id": idx,
+            "text": chunk["text"],
+            "timestamp": chunk["timestamp"],
+            "metadata": metadata
+        }
+        self._replace(merged)
+        return merged
+    
+    def _register(self, chunk: dict):
+        self.store[chunk["id"]] = chunk
+        self._index_chunk(chunk)
+    
+    def _index_chunk(self, chunk: dict):
+        if not self.indexed:
+            return
+        
+        self.metadata_index.add(chunk)
+        self.lexical_index.add(chunk["id"], chunk["text"])
         
-        emb = self.embedder.encode([text])
-        self.index.add(emb)
-        self.store[self.counter] = chunk
+        parent = self.parents.get(chunk.get("parent_id"))
+        if parent is not None:
+            parent["children"].append(chunk["id"])
+    
+    def _unregister(self, chunk: dict):
+        self.store.pop(chunk["id"], None)
+        if not self.indexed:
+            return
         
-        self.counter += 1
+        self.metadata_index.remove(chunk)
+        self.lexical_index.remove(chunk["id"])
         
-        return f"Saved to memory with ID: {chunk['id']}"
+        parent = self.parents.get(chunk.get("parent_id"))
+        if parent is not None and chunk["id"] in parent["children"]:
+            parent["children"].remove(chunk["id"])
+    
+    def _replace(self, chunk: dict):
+        self._unregister(self.store[chunk["id"]])
+        self._register(chunk)
     
-    def search(self, query: str, k: int = 3) -> list[dict]:
-        if self.index.ntotal == 0:
+    def _remove(self, ids: list[int]) -> list[int]:
+        if any(idx in self.parents for idx in ids):
+            self._build_indexes()
+        
+        expanded = []
+        for idx in ids:
+            if idx in self.parents:
+                expanded.extend(self.parents[idx]["children"])
+            else:
+                expanded.append(idx)
+        
+        removed = []
+        for idx in expanded:
+            chunk = self.store.get(idx)
+            if chunk is None:
+                continue
+            
+            self._unregister(chunk)
+            removed.append(idx)
+            
+            parent_id = chunk.get("parent_id")
+            if self.indexed and parent_id in self.parents and not self.parents[parent_id]["children"]:
+                del self.parents[parent_id]
+        
+        self.index.remove(removed)
+        return removed
+    
+    def _evict(self) -> list[int]:
+        max_entries = self.settings.memory_max_entries
+        ttl = self.settings.memory_ttl_seconds
+        if not max_entries and not ttl:
             return []
         
-        q_emb = self.embedder.encode([query])
-        distances, indices = self.index.search(q_emb, min(k, self.index.ntotal))
+        self._build_indexes()
+        cutoff = (datetime.now() - timedelta(seconds=ttl)).isoformat() if ttl else None
+        victims = []
         
-        results = []
-        for idx in indices[0]:
-            if idx in self.store:
-                results.append(self.store[idx])
+        for idx in islice(self.metadata_index.oldest(), self.settings.memory_evict_batch):
+            over_size = max_entries and len(self.store) - len(victims) > max_entries
+            expired = cutoff is not None and self.store[idx]["timestamp"] < cutoff
+            if not over_size and not expired:
+                break
+            victims.append(idx)
         
-        return results
+        return self._remove(victims)
     
-    def get_all(self) -> list[dict]:
-        return list(self.store.values())
+    def _snapshot(self):
+        store = None if isinstance(self.store, SqliteChunkStore) else dict(self.store)
+        parents = {idx: {**parent, "children": list(parent["children"])} for idx, parent in self.parents.items()}
+        return self.persistence.snapshot(self.index.index, store, self.counter, set(self.index.deleted), parents)
     
-    def get_recent(self, n: int = 5) -> list[dict]:
-        all_items = self.get_all()
-        return sorted(all_items, key=lambda x: x["timestamp"], reverse=True)[:n]
+    def _rebuilt(self):
+        if self.persistence and self.settings.memory_on_disk:
+            self.persistence.checkpoint(self.index.index, self.counter)
+            self._snapshot()
+    
+    def _build_indexes(self):
+        if self.indexed:
+            return
+        
+        self.indexed = True
+        for parent in self.parents.values():
+            parent["children"] = []
+        for chunk in self.store.stream():
+            self._index_chunk(chunk)
+        
+        for parent_id in [idx for idx, parent in self.parents.items() if not parent["children"]]:
+            del self.parents[parent_id]
+    
+    def _write_behind_loop(self):
+        stopping = False
+        while not stopping:
+            entry = self.queue.get()
+            if entry is None:
+                self.queue.task_done()
+                return
+            
+            batch = [entry]
+            deadline = time.monotonic() + self.settings.memory_flush_interval
+            
+            while len(batch) < self.settings.memory_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    self.queue.task_done()
+                    stopping = True
+                    break
+                batch.append(entry)
+            
+            try:
+                self._flush_batch(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+    
+    def _flush_batch(self, batch: list[dict]):
+        for attempt in range(self.settings.max_retries + 1):
+            try:
+                self._write(batch)
+                return
+            except Exception as e:
+                if attempt == self.settings.max_retries:
+                    self.errors.append({"chunks": batch, "error": str(e)})
+                    self.logger.error(f"Failed to save {len(batch)} queued memories: {e}")
+                    return
+                time.sleep(2 ** attempt)
+    
+    def _restore(self):
+        snapshot = self.persistence.load_snapshot()
+        
+        if snapshot is None:
+            self.index = create_index(self.settings)
+        else:
+            self.index = create_index(self.settings, snapshot["index"], snapshot["deleted"], snapshot["checkpointed"])
+            self.counter = snapshot["counter"]
+            self.parents = snapshot["parents"]
+            for parent in self.parents.values():
+                parent["children"] = []
+            
+            if snapshot["store"] is not None:
+                for chunk in snapshot["store"].values():
+                    self._register(chunk)
+        
+        for op, record in self.persistence.replay():
+            if op == "remove":
+                removed = self._remove(record["ids"])
+                if isinstance(self.store, SqliteChunkStore):
+                    self.index.remove(set(record["ids"]) - set(removed))
+                continue
+            
+            chunk = record["chunk"]
+            chunk["timestamp"] = normalize_timestamp(chunk.get("timestamp"))
+            
+            if op == "update":
+                if chunk["id"] in self.store:
+                    self._replace(chunk)
+                continue
+            
+            if chunk["id"] < self.counter:
+                continue
+            
+            if op == "parent":
+                chunk["children"] = []
+                self.parents[chunk["id"]] = chunk
+            else:
+                if not self.index.is_checkpointed(chunk["id"]):
+                    self.index.add(record["embedding"], np.array([chunk["id"]], dtype=np.int64))
+                self._register(chunk)
+            
+            self.counter = chunk["id"] + 1
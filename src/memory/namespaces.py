@@ -0,0 +1,215 @@
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import replace
+from pathlib import Path
+
+from src.config import Settings
+from src.memory.embedder import create_embedder
+from src.memory.memory_agent import MemoryAgent
+
+
+DEFAULT_NAMESPACE = "default"
+NAMESPACE_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+current_namespace: ContextVar[str] = ContextVar("memory_namespace", default=DEFAULT_NAMESPACE)
+
+
+def validate_namespace(namespace: str) -> str:
+    if not NAMESPACE_PATTERN.match(namespace) or namespace in (".", ".."):
+        raise ValueError(f"Invalid memory namespace: {namespace!r}")
+    return namespace
+
+
+@contextmanager
+def use_namespace(namespace: str = None):
+    token = current_namespace.set(validate_namespace(namespace or DEFAULT_NAMESPACE))
+    try:
+        yield
+    finally:
+        current_namespace.reset(token)
+
+
+class NamespacedMemory:
+    def __init__(self, settings: Settings = None):
+        self.settings = settings or Settings()
+        self.embedder = create_embedder(self.settings)
+        self.agents = OrderedDict()
+        self.last_used = {}
+        self.active = Counter()
+        self.closing = {}
+        self.lock = threading.Lock()
+    
+    def add(self, text: str, metadata: dict = None, *, namespace: str = None) -> str:
+        with self._use(namespace) as memory:
+            return memory.add(text, metadata)
+    
+    async def aadd(self, text: str, metadata: dict = None, *, namespace: str = None) -> str:
+        with self._use(namespace) as memory:
+            return await memory.aadd(text, metadata)
+    
+    def add_many(self, texts: list[str], metadatas: list[dict] = None, *, namespace: str = None) -> list[int]:
+        with self._use(namespace) as memory:
+            return memory.add_many(texts, metadatas)
+    
+    def search(self, query: str, k: int = 3, *args, namespace: str = None, **kwargs) -> list[dict]:
+        with self._use(namespace) as memory:
+            return memory.search(query, k, *args, **kwargs)
+    
+    def search_many(self, queries: list[str], k: int = 3, *args, namespace: str = None, **kwargs) -> list[list[dict]]:
+        with self._use(namespace) as memory:
+            return memory.search_many(queries, k, *args, **kwargs)
+    
+    async def asearch(self, query: str, k: int = 3, *args, namespace: str = None, **kwargs) -> list[dict]:
+        with self._use(namespace) as memory:
+            return await memory.asearch(query, k, *args, **kwargs)
+    
+    async def asearch_many(self, queries: list[str], k: int = 3, *args, namespace: str = None, **kwargs) -> list[list[dict]]:
+        with self._use(namespace) as memory:
+            return await memory.asearch_many(queries, k, *args, **kwargs)
+    
+    def remove(self, ids: list[int], namespace: str = None) -> int:
+        with self._use(namespace) as memory:
+            return memory.remove(ids)
+    
+    def evict(self, namespace: str = None) -> int:
+        with self._use(namespace) as memory:
+            return memory.evict()
+    
+    def get_parent(self, parent_id: int, namespace: str = None) -> dict:
+        with self._use(namespace) as memory:
+            return memory.get_parent(parent_id)
+    
+    def get_all(self, namespace: str = None) -> list[dict]:
+        with self._use(namespace) as memory:
+            return memory.get_all()
+    
+    def get_recent(self, n: int = 5, namespace: str = None) -> list[dict]:
+        with self._use(namespace) as memory:
+            return memory.get_recent(n)
+    
+    def flush(self):
+        errors = []
+        for memory in list(self.agents.values()):
+            try:
+                memory.flush()
+            except RuntimeError as e:
+                errors.append(str(e))
+        
+        if errors:
+            raise RuntimeError("; ".join(errors))
+    
+    def snapshot(self):
+        for memory in list(self.agents.values()):
+            memory.snapshot()
+    
+    def namespace(self, namespace: str = None) -> MemoryAgent:
+        name = validate_namespace(namespace or current_namespace.get())
+        memory, closed = self._reserve(name, active=False)
+        self._close(closed)
+        return memory
+    
+    def namespaces(self) -> list[str]:
+        names = set(self.agents)
+        if self.settings.memory_dir:
+            root = Path(self.settings.memory_dir) / "namespaces"
+            if root.exists():
+                names.update(path.name for path in root.iterdir() if path.is_dir())
+        return sorted(names)
+    
+    def close_idle(self) -> list[str]:
+        with self.lock:
+            closed = self._close_idle()
+        
+        self._close(closed)
+        return [name for name, memory in closed]
+    
+    def close(self):
+        with self.lock:
+            closed = list(self.agents.items())
+            for name, memory in closed:
+                self.closing[name] = threading.Event()
+            self.agents.clear()
+            self.last_used.clear()
+            pending = list(self.closing.values())
+        
+        self._close(closed)
+        for event in pending:
+            event.wait()
+    
+    @contextmanager
+    def _use(self, namespace: str = None):
+        name = validate_namespace(namespace or current_namespace.get())
+        memory, closed = self._reserve(name)
+        self._close(closed)
+        
+        try:
+            yield memory
+        finally:
+            with self.lock:
+                self.active[name] -= 1
+                self.last_used[name] = time.monotonic()
+    
+    def _reserve(self, name: str, active: bool = True) -> tuple:
+        while True:
+            with self.lock:
+                closing = self.closing.get(name)
+                if closing is None:
+                    memory = self._open(name)
+                    if active:
+                        self.active[name] += 1
+                    return memory, self._close_idle()
+            
+            closing.wait()
+    
+    def _close(self, closed: list[tuple]):
+        for name, memory in closed:
+            try:
+                memory.close()
+            finally:
+                with self.lock:
+                    self.closing.pop(name).set()
+    
+    def _open(self, name: str) -> MemoryAgent:
+        memory = self.agents.get(name)
+        if memory is None:
+            if not self.settings.memory_dir and len(self.agents) >= self.settings.memory_max_namespaces:
+                raise RuntimeError(
+                    f"Cannot open memory namespace {name!r}: MEMORY_MAX_NAMESPACES={self.settings.memory_max_namespaces} "
+                    "namespaces are already open and memory-only namespaces cannot be closed without losing data"
+                )
+            memory = MemoryAgent(self._settings_for(name), self.embedder)
+            self.agents[name] = memory
+        
+        self.agents.move_to_end(name)
+        self.last_used[name] = time.monotonic()
+        return memory
+    
+    def _settings_for(self, name: str) -> Settings:
+        if name == DEFAULT_NAMESPACE or not self.settings.memory_dir:
+            return self.settings
+        return replace(self.settings, memory_dir=str(Path(self.settings.memory_dir) / "namespaces" / name))
+    
+    def _close_idle(self) -> list[tuple]:
+        if not self.settings.memory_dir:
+            return []
+        
+        now = time.monotonic()
+        idle_after = self.settings.memory_namespace_idle
+        overflow = len(self.agents) - self.settings.memory_max_namespaces
+        
+        closed = []
+        for name in list(self.agents):
+            if self.active[name]:
+                continue
+            
+            if overflow > 0 or (idle_after > 0 and now - self.last_used[name] > idle_after):
+                closed.append((name, self.agents.pop(name)))
+                self.last_used.pop(name)
+                self.closing[name] = threading.Event()
+                overflow -= 1
+        
+        return closed
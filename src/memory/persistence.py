@@ -0,0 +1,242 @@
+import base64
+import json
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+
+class MemoryPersistence:
+    def __init__(self, path: str, snapshot_every: int = 1000):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.meta_path = self.path / "meta.json"
+        self.wal_path = self.path / "wal.jsonl"
+        self.snapshot_every = snapshot_every
+        self.pending = 0
+        self.wal = open(self.wal_path, "a", encoding="utf-8")
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-snapshot")
+        self.last = None
+    
+    @property
+    def busy(self) -> bool:
+        return self.last is not None and not self.last.done()
+    
+    def load_snapshot(self) -> dict:
+        if not self.meta_path.exists():
+            return None
+        
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        
+        if "index_files" in meta:
+            index = [faiss.read_index(str(self.path / name)) for name in meta["index_files"]]
+            checkpointed = [self._apply_checkpoint(shard, meta["counter"]) for shard in index]
+        else:
+            index = faiss.read_index(str(self.path / meta["index_file"]))
+            checkpointed = self._apply_checkpoint(index, meta["counter"])
+        
+        return {
+            "index": index,
+            "checkpointed": checkpointed,
+            "store": None if meta["store"] is None else {int(key): chunk for key, chunk in meta["store"].items()},
+            "parents": {int(key): parent for key, parent in meta.get("parents", {}).items()},
+            "counter": meta["counter"],
+            "deleted": set(meta.get("deleted", []))
+        }
+    
+    def replay(self):
+        for path in self._segments() + [self.wal_path]:
+            yield from self._replay_file(path)
+    
+    def _replay_file(self, path: Path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                
+                if "embedding" in record:
+                    record["embedding"] = self._decode(record["embedding"])
+                
+                yield record.get("op", "add"), record
+                self.pending += 1
+    
+    def log_add(self, chunks: list[dict], embeddings: np.ndarray):
+        records = [
+            {"op": "add", "chunk": chunk, "embedding": self._encode(embedding)}
+            for chunk, embedding in zip(chunks, embeddings)
+        ]
+        self._append(records)
+    
+    def log_parents(self, parents: list[dict]):
+        self._append([{"op": "parent", "chunk": parent} for parent in parents])
+    
+    def log_update(self, chunks: list[dict]):
+        self._append([{"op": "update", "chunk": chunk} for chunk in chunks])
+    
+    def log_remove(self, ids: list[int]):
+        self._append([{"op": "remove", "ids": ids}])
+    
+    def should_snapshot(self) -> bool:
+        return self.snapshot_every > 0 and self.pending >= self.snapshot_every
+    
+    def snapshot(self, index, store: dict, counter: int, deleted: set = None, parents: dict = None) -> Future:
+        stamp = time.time_ns()
+        if isinstance(index, list):
+            indexes = index
+            index_files = [f"index-{stamp}-{i}.faiss" for i in range(len(indexes))]
+            meta = {"index_files": index_files}
+        else:
+            indexes = [index]
+            index_files = [f"index-{stamp}.faiss"]
+            meta = {"index_file": index_files[0]}
+        
+        meta.update({
+            "counter": counter,
+            "deleted": sorted(deleted or []),
+            "store": store,
+            "parents": parents or {}
+        })
+        
+        copies = [self._copy(shard) for shard in indexes]
+        lists_files = {self._lists_file(shard) for shard in indexes} - {None}
+        segment = self._rotate(stamp)
+        self.pending = 0
+        
+        self.last = self.writer.submit(self._write, meta, dict(zip(index_files, copies)), lists_files, segment)
+        return self.last
+    
+    def _copy(self, index):
+        if self._lists_file(index) is not None:
+            return faiss.serialize_index(index)
+        return faiss.clone_index(index)
+    
+    def checkpoint(self, index, counter: int):
+        for shard in index if isinstance(index, list) else [index]:
+            name = self._lists_file(shard)
+            if name is None:
+                continue
+            
+            fd = os.open(self.path / name, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            
+            writer = faiss.VectorIOWriter()
+            faiss.write_InvertedLists(faiss.extract_index_ivf(shard).invlists, writer)
+            lists = base64.b64encode(faiss.vector_to_array(writer.data).tobytes()).decode("ascii")
+            self._write_json(self._header_path(name), {"counter": counter, "lists": lists})
+    
+    def _apply_checkpoint(self, index, counter: int) -> int:
+        name = self._lists_file(index)
+        if name is None or not self._header_path(name).exists():
+            return counter
+        
+        with open(self._header_path(name), "r", encoding="utf-8") as f:
+            header = json.load(f)
+        if header["counter"] < counter:
+            return counter
+        
+        reader = faiss.VectorIOReader()
+        faiss.copy_array_to_vector(np.frombuffer(base64.b64decode(header["lists"]), dtype=np.uint8), reader.data)
+        invlists = faiss.read_InvertedLists(reader)
+        invlists.this.disown()
+        
+        ivf = faiss.extract_index_ivf(index)
+        ivf.replace_invlists(invlists, True)
+        ivf.ntotal = invlists.compute_ntotal()
+        index.ntotal = ivf.ntotal
+        return header["counter"]
+    
+    def _header_path(self, name: str) -> Path:
+        return (self.path / name).with_suffix(".header")
+    
+    def _rotate(self, stamp: int) -> Path:
+        self.wal.flush()
+        os.fsync(self.wal.fileno())
+        self.wal.close()
+        
+        segment = self.path / f"wal-{stamp}.jsonl"
+        os.replace(self.wal_path, segment)
+        self.wal = open(self.wal_path, "a", encoding="utf-8")
+        return segment
+    
+    def _segments(self) -> list[Path]:
+        return sorted(self.path.glob("wal-*.jsonl"), key=lambda path: self._stamp(path.name))
+    
+    def _write(self, meta: dict, copies: dict, lists_files: set, segment: Path):
+        for index_file, copy in copies.items():
+            if isinstance(copy, np.ndarray):
+                with open(self.path / index_file, "wb") as f:
+                    f.write(copy)
+            else:
+                faiss.write_index(copy, str(self.path / index_file))
+        
+        index_files = set(copies)
+        self._write_json(self.meta_path, meta)
+        
+        for old in self.path.glob("index-*.faiss"):
+            if old.name not in index_files:
+                old.unlink()
+        
+        if lists_files:
+            oldest = min(self._stamp(name) for name in lists_files)
+            for old in self.path.glob("invlists-*.ivfdata"):
+                if old.name not in lists_files and self._stamp(old.name) < oldest:
+                    old.unlink()
+                    self._header_path(old.name).unlink(missing_ok=True)
+        
+        covered = self._stamp(segment.name)
+        for old in self._segments():
+            if self._stamp(old.name) <= covered:
+                old.unlink()
+    
+    def _write_json(self, path: Path, data: dict):
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    
+    def _lists_file(self, index) -> str:
+        try:
+            ivf = faiss.extract_index_ivf(index)
+        except RuntimeError:
+            return None
+        
+        invlists = faiss.downcast_InvertedLists(ivf.invlists)
+        if isinstance(invlists, faiss.OnDiskInvertedLists):
+            return Path(invlists.filename).name
+        return None
+    
+    def _stamp(self, name: str) -> int:
+        return int(name.split("-", 1)[1].split(".", 1)[0])
+    
+    def _append(self, records: list[dict]):
+        for record in records:
+            self.wal.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        
+        self.wal.flush()
+        os.fsync(self.wal.fileno())
+        self.pending += len(records)
+    
+    def close(self):
+        self.writer.shutdown()
+        self.wal.close()
+    
+    def _encode(self, embedding: np.ndarray) -> str:
+        return base64.b64encode(np.asarray(embedding, dtype=np.float32).tobytes()).decode("ascii")
+    
+    def _decode(self, data: str) -> np.ndarray:
+        return np.frombuffer(base64.b64decode(data), dtype=np.float32).reshape(1, -1)
@@ -0,0 +1,241 @@
+import asyncio
+import ipaddress
+import os
+import secrets
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+
+from src.config import Settings
+from src.memory.memory_agent import MemoryAgent
+from src.memory.namespaces import NamespacedMemory, current_namespace, use_namespace
+
+
+METHODS = (
+    "add",
+    "add_many",
+    "search",
+    "search_many",
+    "remove",
+    "evict",
+    "flush",
+    "snapshot",
+    "get_parent",
+    "get_all",
+    "get_recent"
+)
+
+
+def parse_address(address: str):
+    host, sep, port = address.rpartition(":")
+    if sep and host and port.isdigit():
+        return host, int(port)
+    return address
+
+
+def is_loopback(address) -> bool:
+    if isinstance(address, str):
+        return True
+    
+    host = address[0]
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def load_authkey(settings: Settings, authkey: str = None, create: bool = False) -> bytes:
+    authkey = authkey or settings.memory_server_authkey
+    if authkey:
+        return authkey.encode("utf-8")
+    
+    path = Path(settings.memory_server_authkey_file)
+    if create and not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_hex(32))
+    
+    if not path.exists():
+        raise RuntimeError(
+            f"Memory server authkey is not configured: set MEMORY_SERVER_AUTHKEY "
+            f"or start the server to generate {path}"
+        )
+    if path.stat().st_mode & 0o077:
+        raise PermissionError(f"Memory server authkey file {path} must be readable only by its owner (chmod 600)")
+    
+    return path.read_text().strip().encode("utf-8")
+
+
+class MemoryServer:
+    def __init__(self, memory: MemoryAgent = None, address: str = None, authkey: str = None, settings: Settings = None):
+        settings = settings or Settings()
+        self.address = parse_address(address or settings.memory_server_address)
+        if not settings.memory_server_allow_remote and not is_loopback(self.address):
+            raise ValueError(
+                f"Refusing to listen on non-loopback address {self.address[0]}: "
+                f"set MEMORY_SERVER_ALLOW_REMOTE=true to expose the memory server"
+            )
+        
+        self.authkey = load_authkey(settings, authkey, create=True)
+        self.memory = memory or NamespacedMemory(settings)
+        self.listener = None
+        self.running = False
+    
+    def serve_forever(self):
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+        
+        self.listener = Listener(self.address, authkey=self.authkey)
+        self.running = True
+        
+        try:
+            while self.running:
+                try:
+                    conn = self.listener.accept()
+                except AuthenticationError:
+                    continue
+                except (OSError, EOFError):
+                    if not self.running:
+                        break
+                    continue
+                
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            self.listener.close()
+    
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+    
+    def stop(self):
+        self.running = False
+        if self.listener is not None:
+            self.listener.close()
+        self.memory.close()
+    
+    def _handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    method, args, kwargs, namespace = conn.recv()
+                except (EOFError, OSError):
+                    return
+                
+                if method not in METHODS:
+                    conn.send(("error", ValueError(f"Unknown memory method: {method}")))
+                    continue
+                
+                try:
+                    with use_namespace(namespace):
+                        result = getattr(self.memory, method)(*args, **kwargs)
+                    conn.send(("ok", result))
+                except Exception as e:
+                    conn.send(("error", e))
+
+
+class MemoryClient:
+    def __init__(self, address: str = None, authkey: str = None, settings: Settings = None):
+        settings = settings or Settings()
+        self.address = parse_address(address or settings.memory_server_address)
+        self.authkey = load_authkey(settings, authkey)
+        self.local = threading.local()
+    
+    def add(self, text: str, metadata: dict = None) -> str:
+        return self._call("add", text, metadata)
+    
+    async def aadd(self, text: str, metadata: dict = None) -> str:
+        return await asyncio.to_thread(self._call, "add", text, metadata)
+    
+    def add_many(self, texts: list[str], metadatas: list[dict] = None) -> list[int]:
+        return self._call("add_many", texts, metadatas)
+    
+    def search(self, query: str, k: int = 3, **kwargs) -> list[dict]:
+        return self._call("search", query, k, **kwargs)
+    
+    def search_many(self, queries: list[str], k: int = 3, **kwargs) -> list[list[dict]]:
+        return self._call("search_many", queries, k, **kwargs)
+    
+    async def asearch(self, query: str, k: int = 3, **kwargs) -> list[dict]:
+        return await asyncio.to_thread(self._call, "search", query, k, **kwargs)
+    
+    async def asearch_many(self, queries: list[str], k: int = 3, **kwargs) -> list[list[dict]]:
+        return await asyncio.to_thread(self._call, "search_many", queries, k, **kwargs)
+    
+    def remove(self, ids: list[int]) -> int:
+        return self._call("remove", ids)
+    
+    def evict(self) -> int:
+        return self._call("evict")
+    
+    def flush(self):
+        return self._call("flush")
+    
+    def snapshot(self):
+        return self._call("snapshot")
+    
+    def get_parent(self, parent_id: int) -> dict:
+        return self._call("get_parent", parent_id)
+    
+    def get_all(self) -> list[dict]:
+        return self._call("get_all")
+    
+    def get_recent(self, n: int = 5) -> list[dict]:
+        return self._call("get_recent", n)
+    
+    def close(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+    
+    def _call(self, method: str, *args, **kwargs):
+        conn = self._connection()
+        message = (method, args, kwargs, current_namespace.get())
+        
+        try:
+            conn.send(message)
+        except OSError:
+            self.close()
+            conn = self._connection()
+            conn.send(message)
+        
+        status, result = conn.recv()
+        
+        if status == "error":
+            raise result
+        return result
+    
+    def _connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = Client(self.address, authkey=self.authkey)
+            self.local.conn = conn
+        return conn
+
+
+def create_memory(settings: Settings = None):
+    settings = settings or Settings()
+    if settings.memory_server_address:
+        return MemoryClient(settings=settings)
+    return NamespacedMemory(settings)
+
+
+if __name__ == "__main__":
+    settings = Settings()
+    server = MemoryServer(settings=settings)
+    print(f"🧠 Memory server listening on {server.address}")
+    if not settings.memory_server_authkey:
+        print(f"🔑 Authkey file: {settings.memory_server_authkey_file}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
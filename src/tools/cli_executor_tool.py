@@ -21,14 +21,15 @@ class CLIExecutorTool(BaseTool):
         super().__init__(executor=CLIExecutor())
     
     def _run(self, command: str) -> str:
-        result = self.executor.run(command)
-        
+        return self._format(self.executor.run(command))
+    
+    async def _arun(self, command: str) -> str:
+        return self._format(await self.executor.arun(command))
+    
+    def _format(self, result: dict) -> str:
         if result["status"] == "success":
             stdout = result.get("stdout", "").strip()
             return f"✅ {stdout}" if stdout else "✅ Команда выполнена (нет вывода)"
         else:
             stderr = result.get("stderr", "").strip()
             return f"❌ Ошибка: {stderr}" if stderr else "❌ Команда завершилась с ошибкой"
-    
-    async def _arun(self, command: str) -> str:
-        return self._run(command)
@@ -21,12 +21,13 @@ class CodeExecutorTool(BaseTool):
         super().__init__(executor=CodeExecutor())
     
     def _run(self, code: str) -> str:
-        result = self.executor.run(code)
-        
+        return self._format(self.executor.run(code))
+    
+    async def _arun(self, code: str) -> str:
+        return self._format(await self.executor.arun(code))
+    
+    def _format(self, result: dict) -> str:
         if result["status"] == "success":
             return f"✅ Успешно выполнено:\n{result['output']}"
         else:
             return f"❌ Ошибка:\n{result['traceback']}"
-    
-    async def _arun(self, code: str) -> str:
-        return self._run(code)
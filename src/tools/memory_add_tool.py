@@ -1,7 +1,10 @@
+from typing import Union
+
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 
-from src.memory import MemoryAgent
+from src.memory import MemoryAgent, NamespacedMemory
+from src.memory.server import MemoryClient
 
 
 class MemoryAddInput(BaseModel):
@@ -18,9 +21,9 @@ class AddToMemoryTool(BaseTool):
         "ТОЛЬКО для Orchestrator."
     )
     args_schema: type[BaseModel] = MemoryAddInput
-    memory: MemoryAgent = None
+    memory: Union[MemoryAgent, MemoryClient, NamespacedMemory] = None
     
-    def __init__(self, memory: MemoryAgent):
+    def __init__(self, memory: Union[MemoryAgent, MemoryClient, NamespacedMemory]):
         super().__init__(memory=memory)
     
     def _run(self, text: str, agent: str, action: str) -> str:
@@ -33,4 +36,10 @@ class AddToMemoryTool(BaseTool):
         return f"💾 {result}"
     
     async def _arun(self, text: str, agent: str, action: str) -> str:
-        return self._run(text, agent, action)
+        metadata = {
+            "agent": agent,
+            "action": action
+        }
+        
+        result = await self.memory.aadd(text, metadata)
+        return f"💾 {result}"
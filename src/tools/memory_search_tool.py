@@ -1,11 +1,18 @@
+from typing import Optional, Union
+
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 
-from src.memory import MemoryAgent
+from src.memory import MemoryAgent, NamespacedMemory
+from src.memory.server import MemoryClient
 
 
 class MemorySearchInput(BaseModel):
-    query: str = Field(description="Поисковый запрос для поиска в истории памяти")
+    query: str = Field(default="", description="Поисковый запрос для поиска в истории памяти")
+    queries: Optional[list[str]] = Field(
+        default=None,
+        description="Несколько формулировок запроса для поиска за один вызов"
+    )
 
 
 class SearchMemoryTool(BaseTool):
@@ -13,29 +20,56 @@ class SearchMemoryTool(BaseTool):
     description: str = (
         "Ищет в истории выполненных задач и действий агентов. "
         "Используй чтобы найти похожие решения, код, команды из прошлых задач. "
+        "Можно передать несколько формулировок в queries. "
         "Доступен всем агентам."
     )
     args_schema: type[BaseModel] = MemorySearchInput
-    memory: MemoryAgent = None
+    memory: Union[MemoryAgent, MemoryClient, NamespacedMemory] = None
     
-    def __init__(self, memory: MemoryAgent):
+    def __init__(self, memory: Union[MemoryAgent, MemoryClient, NamespacedMemory]):
         super().__init__(memory=memory)
     
-    def _run(self, query: str) -> str:
-        results = self.memory.search(query, k=3)
+    def _run(self, query: str = "", queries: Optional[list[str]] = None) -> str:
+        all_queries = self._queries(query, queries)
+        
+        if not all_queries:
+            return "❌ Не указан поисковый запрос"
+        
+        return self._format(all_queries, self.memory.search_many(all_queries, k=3))
+    
+    async def _arun(self, query: str = "", queries: Optional[list[str]] = None) -> str:
+        all_queries = self._queries(query, queries)
         
-        if not results:
-            return "🔍 Ничего не найдено в памяти. Это первая подобная задача."
+        if not all_queries:
+            return "❌ Не указан поисковый запрос"
+        
+        return self._format(all_queries, await self.memory.asearch_many(all_queries, k=3))
+    
+    def _queries(self, query: str, queries: Optional[list[str]]) -> list[str]:
+        all_queries = [q for q in [query, *(queries or [])] if q]
+        return list(dict.fromkeys(all_queries))
+    
+    def _format(self, all_queries: list[str], results_per_query: list[list[dict]]) -> str:
+        if not any(results_per_query):
+            return "🔍 В памяти нет ничего релевантного запросу. Продолжай без опоры на прошлые задачи."
         
         output = ["🧠 Найдено в истории памяти:\n"]
         
-        for idx, item in enumerate(results, 1):
-            output.append(f"{idx}. [{item['metadata'].get('agent', 'unknown')}] {item['metadata'].get('action', 'action')}")
-            output.append(f"   Время: {item['timestamp']}")
-            output.append(f"   {item['text'][:200]}...")
-            output.append("")
+        for q, results in zip(all_queries, results_per_query):
+            if len(all_queries) > 1:
+                output.append(f"Запрос: {q}")
+                if not results:
+                    output.append("   Ничего релевантного\n")
+                    continue
+            
+            for idx, item in enumerate(results, 1):
+                output.append(f"{idx}. [{item['metadata'].get('agent', 'unknown')}] {item['metadata'].get('action', 'action')}")
+                output.append(f"   Время: {item['timestamp']}")
+                if item.get("distance") is not None:
+                    output.append(f"   Схожесть: {1.0 - item['distance'] / 2:.2f}")
+                if item.get("parent_id") is not None:
+                    output.append(f"   Фрагмент записи #{item['parent_id']}")
+                output.append(f"   {item['text'][:200]}...")
+                output.append("")
         
         return "\n".join(output)
-    
-    async def _arun(self, query: str) -> str:
-        return self._run(query)
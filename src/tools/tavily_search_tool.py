@@ -29,8 +29,12 @@ class TavilySearchTool(BaseTool):
         )
     
     def _run(self, query: str) -> str:
-        results = self.tavily.invoke({"query": query})
-        
+        return self._format(self.tavily.invoke({"query": query}))
+    
+    async def _arun(self, query: str) -> str:
+        return self._format(await self.tavily.ainvoke({"query": query}))
+    
+    def _format(self, results: list[dict]) -> str:
         if not results:
             return "Информация не найдена."
         
@@ -41,6 +45,3 @@ class TavilySearchTool(BaseTool):
             output.append(f"   Источник: {result.get('url', '')}\n")
         
         return "\n".join(output)
-    
-    async def _arun(self, query: str) -> str:
-        return self._run(query)
@@ -1,3 +1,5 @@
 from .logger import AgentLogger
+from .streaming import LoggerStreamHandler, invoke_streaming, ainvoke_streaming
+from .tool_runner import ToolRunner
 
-__all__ = ["AgentLogger"]
+__all__ = ["AgentLogger", "LoggerStreamHandler", "invoke_streaming", "ainvoke_streaming", "ToolRunner"]
@@ -0,0 +1,51 @@
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage
+
+from src.utils.logger import AgentLogger
+
+
+class LoggerStreamHandler(BaseCallbackHandler):
+    run_inline = True
+    
+    def __init__(self, logger: AgentLogger, title: str = "Response"):
+        self.logger = logger
+        self.title = title
+        self.started = False
+    
+    def on_llm_new_token(self, token: str, **kwargs):
+        if not token:
+            return
+        
+        if not self.started:
+            self.logger.stream_start(self.title)
+            self.started = True
+        self.logger.stream_token(token)
+
+
+def invoke_streaming(llm, messages: list[BaseMessage], logger: AgentLogger = None, title: str = "Response") -> BaseMessage:
+    if logger is None:
+        return llm.invoke(messages)
+    
+    handler = LoggerStreamHandler(logger, title)
+    response = llm.invoke(messages, config={"callbacks": [handler]})
+    return _finish_streaming(handler, response)
+
+
+async def ainvoke_streaming(llm, messages: list[BaseMessage], logger: AgentLogger = None, title: str = "Response") -> BaseMessage:
+    if logger is None:
+        return await llm.ainvoke(messages)
+    
+    handler = LoggerStreamHandler(logger, title)
+    response = await llm.ainvoke(messages, config={"callbacks": [handler]})
+    return _finish_streaming(handler, response)
+
+
+def _finish_streaming(handler: LoggerStreamHandler, response: BaseMessage) -> BaseMessage:
+    if handler.started:
+        handler.logger.stream_end()
+    elif response.content:
+        handler.logger.stream_start(handler.title)
+        handler.logger.stream_token(response.content)
+        handler.logger.stream_end()
+    
+    return response
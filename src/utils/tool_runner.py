@@ -0,0 +1,65 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from src.config import Settings
+
+
+class ToolRunner:
+    def __init__(self, tools: list, settings: Settings = None):
+        settings = settings or Settings()
+        self.tools = {tool.name: tool for tool in tools}
+        self.serial = {name.strip() for name in settings.tool_serial.split(",") if name.strip()}
+        self.workers = max(1, settings.tool_workers)
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tool")
+    
+    def select(self, tool_calls: list[dict]) -> list[dict]:
+        return [tool_call for tool_call in tool_calls if tool_call["name"] in self.tools]
+    
+    def run(self, tool_calls: list[dict]) -> list:
+        if self.workers == 1 or len(tool_calls) <= 1:
+            return [self._invoke(tool_call) for tool_call in tool_calls]
+        
+        groups = self._groups(tool_calls)
+        futures = [
+            self.pool.submit(copy_context().run, self._invoke_group, [tool_calls[i] for i in group])
+            for group in groups
+        ]
+        return self._ordered(len(tool_calls), groups, [future.result() for future in futures])
+    
+    async def arun(self, tool_calls: list[dict]) -> list:
+        if self.workers == 1 or len(tool_calls) <= 1:
+            return [await self._ainvoke(tool_call) for tool_call in tool_calls]
+        
+        semaphore = asyncio.Semaphore(self.workers)
+        
+        async def run_group(group: list[int]) -> list:
+            async with semaphore:
+                return [await self._ainvoke(tool_calls[i]) for i in group]
+        
+        groups = self._groups(tool_calls)
+        outputs = await asyncio.gather(*(run_group(group) for group in groups))
+        return self._ordered(len(tool_calls), groups, outputs)
+    
+    def _invoke(self, tool_call: dict):
+        return self.tools[tool_call["name"]].invoke(tool_call["args"])
+    
+    async def _ainvoke(self, tool_call: dict):
+        return await self.tools[tool_call["name"]].ainvoke(tool_call["args"])
+    
+    def _invoke_group(self, tool_calls: list[dict]) -> list:
+        return [self._invoke(tool_call) for tool_call in tool_calls]
+    
+    def _groups(self, tool_calls: list[dict]) -> list[list[int]]:
+        serial = [i for i, tool_call in enumerate(tool_calls) if tool_call["name"] in self.serial]
+        groups = [[i] for i, tool_call in enumerate(tool_calls) if tool_call["name"] not in self.serial]
+        if serial:
+            groups.insert(0, serial)
+        return groups
+    
+    def _ordered(self, count: int, groups: list[list[int]], outputs: list[list]) -> list:
+        results = [None] * count
+        for group, output in zip(groups, outputs):
+            for i, result in zip(group, output):
+                results[i] = result
+        return results